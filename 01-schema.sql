@@ -6,7 +6,8 @@ CREATE TABLE "User" (
     password VARCHAR(255) NOT NULL, -- Armazenar hashes de senhas, NUNCA texto plano!
     role VARCHAR(50) NOT NULL, -- Ex: 'Estudante', 'Professor', 'Admin'
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    tokens_valid_after TIMESTAMP WITH TIME ZONE -- Tokens emitidos antes disso foram revogados
 );
 
 -- Tabela Professor
@@ -105,6 +106,21 @@ CREATE TABLE Task_estudante (
     UNIQUE (student_id, task_id) -- Garante que uma tarefa não seja atribuída ao mesmo estudante mais de uma vez
 );
 
+-- Token buckets do login compartilhados entre workers (THROTTLE_BACKEND=database)
+CREATE TABLE "Throttle_bucket" (
+    bucket_key VARCHAR(255) PRIMARY KEY,
+    tokens DOUBLE PRECISION NOT NULL,
+    updated_at DOUBLE PRECISION NOT NULL -- epoch em segundos
+);
+
+-- Relatórios de linhas rejeitadas da importação de usuários (POST /users/import)
+CREATE TABLE "Import_report" (
+    report_id VARCHAR(32) PRIMARY KEY,
+    content TEXT NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
 -- Índices para otimização de consultas em chaves estrangeiras
 CREATE INDEX idx_professor_user_id ON Professor (user_id);
 CREATE INDEX idx_estudante_user_id ON Estudante (user_id);
@@ -114,8 +130,24 @@ CREATE INDEX idx_projeto_ngo_id ON Projeto (ngo_id);
 CREATE INDEX idx_task_projeto_id ON Task (projeto_id);
 CREATE INDEX idx_matricula_projetos_student_id ON Matricula_Projetos (student_id);
 CREATE INDEX idx_matricula_projetos_projeto_id ON Matricula_Projetos (projeto_id);
-CREATE INDEX idx_task_estudante_student_id ON Task_estudante (student_id);
+-- Cobre também as buscas só por student_id
+CREATE INDEX idx_task_estudante_student_deadline ON Task_estudante (student_id, deadline_date);
 CREATE INDEX idx_task_estudante_task_id ON Task_estudante (task_id);
+CREATE INDEX idx_user_tokens_valid_after ON "User" (tokens_valid_after);
+CREATE INDEX idx_throttle_bucket_updated_at ON "Throttle_bucket" (updated_at);
+CREATE INDEX idx_import_report_expires_at ON "Import_report" (expires_at);
+
+-- Índices para os filtros de listagem (/projetos e /estudantes)
+CREATE INDEX idx_projeto_status ON Projeto (status);
+CREATE INDEX idx_estudante_curso ON Estudante (curso);
+CREATE INDEX idx_estudante_vinculo ON Estudante (vinculo);
+-- Busca por trecho do nome (?full_name=) com ILIKE '%...%'
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX idx_estudante_full_name_trgm ON Estudante USING gin (full_name gin_trgm_ops);
+
+-- Contagens por status de GET /stats (index-only scan quando não há agrupamento)
+CREATE INDEX idx_task_status ON Task (status);
+CREATE INDEX idx_task_estudante_status_assigned ON Task_estudante (status, assigned_date);
 
 -- Funções para atualizar automaticamente 'updated_at'
 CREATE OR REPLACE FUNCTION update_timestamp()
@@ -170,4 +202,84 @@ EXECUTE FUNCTION update_timestamp();
 CREATE TRIGGER set_task_estudante_timestamp
 BEFORE UPDATE ON Task_estudante
 FOR EACH ROW
-EXECUTE FUNCTION update_timestamp();
\ No newline at end of file
+EXECUTE FUNCTION update_timestamp();
+
+-- Portfolios de GET /professores/{id}/portfolio e GET /ongs/{id}/portfolio,
+-- atualizados pela API (app/portfolio.py) com REFRESH ... CONCURRENTLY.
+-- As colunas espelham portfolio_query().
+CREATE MATERIALIZED VIEW professor_portfolio AS
+WITH owners AS (
+    SELECT p.projeto_id, d.professor_id AS owner_id
+    FROM Projeto p
+    JOIN Disciplina d ON d.disciplina_id = p.disciplina_id
+),
+projects AS (
+    SELECT owner_id, COUNT(*) AS projects
+    FROM owners
+    GROUP BY owner_id
+),
+students AS (
+    SELECT o.owner_id, COUNT(DISTINCT m.student_id) AS students
+    FROM owners o
+    JOIN Matricula_Projetos m ON m.projeto_id = o.projeto_id
+    GROUP BY o.owner_id
+),
+tasks AS (
+    SELECT o.owner_id,
+           COUNT(DISTINCT CASE WHEN COALESCE(t.status, '') <> 'Concluída' THEN t.task_id END) AS open_tasks,
+           COUNT(CASE WHEN te.deadline_date < CURRENT_DATE AND COALESCE(te.status, '') <> 'Concluída' THEN te.estud_task_id END) AS overdue_assignments
+    FROM owners o
+    JOIN Task t ON t.projeto_id = o.projeto_id
+    LEFT JOIN Task_estudante te ON te.task_id = t.task_id
+    GROUP BY o.owner_id
+)
+SELECT pr.professor_id AS owner_id,
+       COALESCE(projects.projects, 0) AS projects,
+       COALESCE(students.students, 0) AS students,
+       COALESCE(tasks.open_tasks, 0) AS open_tasks,
+       COALESCE(tasks.overdue_assignments, 0) AS overdue_assignments,
+       NOW() AS refreshed_at
+FROM Professor pr
+LEFT JOIN projects ON projects.owner_id = pr.professor_id
+LEFT JOIN students ON students.owner_id = pr.professor_id
+LEFT JOIN tasks ON tasks.owner_id = pr.professor_id;
+-- REFRESH MATERIALIZED VIEW CONCURRENTLY exige um índice único
+CREATE UNIQUE INDEX professor_portfolio_owner_id ON professor_portfolio (owner_id);
+
+CREATE MATERIALIZED VIEW ong_portfolio AS
+WITH owners AS (
+    SELECT projeto_id, ngo_id AS owner_id
+    FROM Projeto
+),
+projects AS (
+    SELECT owner_id, COUNT(*) AS projects
+    FROM owners
+    GROUP BY owner_id
+),
+students AS (
+    SELECT o.owner_id, COUNT(DISTINCT m.student_id) AS students
+    FROM owners o
+    JOIN Matricula_Projetos m ON m.projeto_id = o.projeto_id
+    GROUP BY o.owner_id
+),
+tasks AS (
+    SELECT o.owner_id,
+           COUNT(DISTINCT CASE WHEN COALESCE(t.status, '') <> 'Concluída' THEN t.task_id END) AS open_tasks,
+           COUNT(CASE WHEN te.deadline_date < CURRENT_DATE AND COALESCE(te.status, '') <> 'Concluída' THEN te.estud_task_id END) AS overdue_assignments
+    FROM owners o
+    JOIN Task t ON t.projeto_id = o.projeto_id
+    LEFT JOIN Task_estudante te ON te.task_id = t.task_id
+    GROUP BY o.owner_id
+)
+SELECT ong.ngo_id AS owner_id,
+       COALESCE(projects.projects, 0) AS projects,
+       COALESCE(students.students, 0) AS students,
+       COALESCE(tasks.open_tasks, 0) AS open_tasks,
+       COALESCE(tasks.overdue_assignments, 0) AS overdue_assignments,
+       NOW() AS refreshed_at
+FROM ONG ong
+LEFT JOIN projects ON projects.owner_id = ong.ngo_id
+LEFT JOIN students ON students.owner_id = ong.ngo_id
+LEFT JOIN tasks ON tasks.owner_id = ong.ngo_id;
+-- REFRESH MATERIALIZED VIEW CONCURRENTLY exige um índice único
+CREATE UNIQUE INDEX ong_portfolio_owner_id ON ong_portfolio (owner_id);
\ No newline at end of file
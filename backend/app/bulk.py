@@ -0,0 +1,92 @@
+import os
+from typing import Dict, List, Sequence, Tuple
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import schemas
+from .database import UPSERT_INSERTS
+from .pagination import match_ids
+from .repository import Reference
+
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "500"))
+
+def check_size(items: Sequence):
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {BULK_MAX_ITEMS} items per request",
+        )
+
+
+async def _existing(db: AsyncSession, column, ids: set) -> set:
+    if not ids:
+        return set()
+    dialect_name = db.get_bind().dialect.name
+    result = await db.execute(select(column).where(match_ids(column, sorted(ids), dialect_name)))
+    return set(result.scalars())
+
+
+def _error(index: int, code: int, detail: str) -> schemas.BulkItemResult:
+    return schemas.BulkItemResult(index=index, status=code, body={"detail": detail})
+
+
+async def bulk_create(
+    db: AsyncSession,
+    model,
+    read_schema: type,
+    items: Sequence[BaseModel],
+    references: Sequence[Reference],
+    unique: Tuple[str, ...],
+    duplicate_detail: str,
+) -> List[schemas.BulkItemResult]:
+    """Cria vários registros com uma query por referência e um INSERT multi-linha.
+
+    Itens com referência inexistente (404) ou que repetem a chave ``unique``,
+    no próprio lote ou no banco (400), não interrompem os demais.
+    """
+    results: Dict[int, schemas.BulkItemResult] = {}
+    for ref in references:
+        found = await _existing(db, ref.column, {getattr(item, ref.field) for item in items})
+        for index, item in enumerate(items):
+            if index not in results and getattr(item, ref.field) not in found:
+                results[index] = _error(index, status.HTTP_404_NOT_FOUND, ref.detail)
+
+    pending: Dict[tuple, int] = {}
+    for index, item in enumerate(items):
+        if index in results:
+            continue
+        key = tuple(getattr(item, name) for name in unique)
+        if key in pending:
+            results[index] = _error(index, status.HTTP_400_BAD_REQUEST, duplicate_detail)
+        else:
+            pending[key] = index
+
+    if pending:
+        dialect_name = db.get_bind().dialect.name
+        stmt = UPSERT_INSERTS[dialect_name](model) if dialect_name in UPSERT_INSERTS else insert(model)
+        if dialect_name in UPSERT_INSERTS:
+            # Já existentes no banco não voltam no RETURNING em vez de abortar o lote
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(unique))
+        # Campos None ficam de fora para valer o default do banco (ex.: matricula_date)
+        rows = [items[index].model_dump(exclude_none=True) for index in pending.values()]
+        try:
+            created = (await db.scalars(stmt.returning(model), rows)).all()
+            for obj in created:
+                index = pending.pop(tuple(getattr(obj, name) for name in unique))
+                body = jsonable_encoder(read_schema.model_validate(obj))
+                results[index] = schemas.BulkItemResult(index=index, status=status.HTTP_201_CREATED, body=body)
+            await db.commit()
+        except IntegrityError:
+            # FK removida entre a validação e o INSERT, ou dialeto sem ON CONFLICT
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Bulk insert conflicted with a concurrent change; retry the request",
+            )
+        for index in pending.values():
+            results[index] = _error(index, status.HTTP_400_BAD_REQUEST, duplicate_detail)
+
+    return [results[index] for index in range(len(items))]
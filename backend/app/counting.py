@@ -0,0 +1,92 @@
+import os
+import json
+from fastapi import Response
+from sqlalchemy import func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from .cache import TTLCache
+
+TOTAL_COUNT_HEADER = "X-Total-Count"
+# exact (contado agora), cached (contagem exata recente) ou estimate (planner)
+TOTAL_COUNT_SOURCE_HEADER = "X-Total-Count-Source"
+
+# Tabelas sem filtro com mais linhas que isso usam pg_class.reltuples
+COUNT_ESTIMATE_MIN_ROWS = int(os.getenv("COUNT_ESTIMATE_MIN_ROWS", "50000"))
+# Consultas filtradas cujo custo estimado pelo planner passa disso usam "Plan Rows"
+COUNT_EXACT_MAX_COST = float(os.getenv("COUNT_EXACT_MAX_COST", "10000"))
+COUNT_CACHE_TTL_SECONDS = float(os.getenv("COUNT_CACHE_TTL_SECONDS", "30"))
+COUNT_CACHE_MAX_SIZE = int(os.getenv("COUNT_CACHE_MAX_SIZE", "1024"))
+
+count_cache = TTLCache(maxsize=COUNT_CACHE_MAX_SIZE, ttl=COUNT_CACHE_TTL_SECONDS)
+
+
+def _cache_key(stmt: Select, dialect) -> tuple:
+    compiled = stmt.compile(dialect=dialect)
+    return (str(compiled), tuple(sorted((k, repr(v)) for k, v in compiled.params.items())))
+
+
+def _table_name(stmt: Select, dialect):
+    froms = stmt.get_final_froms()
+    if len(froms) == 1 and hasattr(froms[0], "fullname"):
+        # Com aspas quando necessário ("Task_estudante"), igual às queries geradas
+        return dialect.identifier_preparer.format_table(froms[0])
+    return None
+
+
+async def _reltuples(db: AsyncSession, table_name: str):
+    result = await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"),
+        {"name": table_name},
+    )
+    value = result.scalar()
+    # -1: tabela nunca analisada (VACUUM/ANALYZE)
+    return value if value is not None and value >= 0 else None
+
+
+async def _plan(db: AsyncSession, stmt: Select):
+    # render_postcompile expande os IN (...) em um parâmetro por valor
+    compiled = stmt.compile(dialect=db.get_bind().dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.construct_params()
+    # Valores seguem como parâmetros do driver ($1, $2...), nunca interpolados no SQL
+    connection = await db.connection()
+    result = await connection.exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + compiled.string,
+        tuple(params[name] for name in compiled.positiontup),
+    )
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    root = plan[0]["Plan"]
+    return root["Total Cost"], int(root["Plan Rows"])
+
+
+async def total_count(db: AsyncSession, stmt: Select):
+    """Total de linhas de ``stmt`` (sem paginação) e a origem do número."""
+    stmt = stmt.order_by(None).limit(None).offset(None)
+    count_stmt = stmt.with_only_columns(func.count(), maintain_column_froms=True)
+    dialect = db.get_bind().dialect
+    key = _cache_key(count_stmt, dialect)
+    cached = count_cache.get(key)
+    if cached is not None:
+        return cached, "cached"
+
+    if dialect.name == "postgresql":
+        table_name = _table_name(stmt, dialect)
+        if stmt.whereclause is None and table_name is not None:
+            estimate = await _reltuples(db, table_name)
+            if estimate is not None and estimate >= COUNT_ESTIMATE_MIN_ROWS:
+                return estimate, "estimate"
+        else:
+            cost, rows = await _plan(db, stmt)
+            if cost > COUNT_EXACT_MAX_COST:
+                return rows, "estimate"
+
+    total = (await db.execute(count_stmt)).scalar_one()
+    count_cache.set(key, total)
+    return total, "exact"
+
+
+async def set_total_count(db: AsyncSession, stmt: Select, response: Response):
+    total, source = await total_count(db, stmt)
+    response.headers[TOTAL_COUNT_HEADER] = str(total)
+    response.headers[TOTAL_COUNT_SOURCE_HEADER] = source
@@ -0,0 +1,5 @@
+from fastapi import HTTPException, status
+
+
+def bad_request(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
@@ -0,0 +1,82 @@
+import os
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Callable
+from fastapi import Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from .pagination import Ordering, primary_key_order
+
+# Linhas buscadas por vez do cursor no servidor (e escritas por chunk da resposta)
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def export_format(format: str = Query("ndjson", pattern="^(ndjson|csv)$")) -> str:
+    return format
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _ndjson(rows, columns) -> str:
+    return "".join(
+        json.dumps(dict(zip(columns, row)), default=_json_default, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+def _csv(rows, columns=None) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if columns is not None:
+        writer.writerow(columns)
+    writer.writerows(["" if value is None else value for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+def export_columns(model, schema: type) -> list:
+    """Colunas do schema de leitura: o que a API já expõe (User sem password)."""
+    return [getattr(model, name) for name in schema.model_fields if name in model.__mapper__.columns]
+
+
+async def _stream_rows(sessions: Callable[[], AsyncSession], stmt: Select, columns: list, fmt: str):
+    if fmt == "csv":
+        yield _csv((), columns)
+    # Sessão do próprio gerador: o corpo é enviado depois que o endpoint retorna
+    async with sessions() as db:
+        # yield_per abre um cursor no servidor (asyncpg) e busca EXPORT_BATCH_SIZE linhas por vez
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        try:
+            async for rows in result.partitions():
+                yield _ndjson(rows, columns) if fmt == "ndjson" else _csv(rows)
+        finally:
+            await result.close()
+
+
+def export_response(sessions: Callable[[], AsyncSession], model, schema: type, fmt: str, conditions=(), order: Ordering = ()) -> StreamingResponse:
+    columns = export_columns(model, schema)
+    order = order or primary_key_order(model)
+    stmt = (
+        select(*columns)
+        .where(*conditions)
+        .order_by(*(column.desc() if descending else column.asc() for column, descending in order))
+    )
+    names = [column.key for column in columns]
+    filename = f"{model.__tablename__.lower()}.{fmt}"
+    return StreamingResponse(
+        _stream_rows(sessions, stmt, names, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
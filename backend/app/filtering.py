@@ -0,0 +1,149 @@
+import inspect
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence
+from fastapi import Query, Request
+from sqlalchemy import String
+from .pagination import Ordering
+from .errors import bad_request
+
+# Operadores aceitos como sufixo do parâmetro: ?status__in=a,b&start_date__gte=2024-01-01
+# Igualdade, IN e intervalos são aplicados direto na coluna (sem funções em volta)
+# para que o planner use os índices; contains vira ILIKE e só vale para texto.
+OPERATORS = ("eq", "in", "gte", "lte", "contains")
+
+
+@dataclass
+class ListQuery:
+    conditions: List[Any] = field(default_factory=list)
+    order: Ordering = field(default_factory=list)
+
+
+def _declared_query_params(dependant, names: set):
+    for param in dependant.query_params:
+        names.add(param.alias)
+    for sub in dependant.dependencies:
+        _declared_query_params(sub, names)
+    return names
+
+
+_route_params_cache: Dict[int, set] = {}
+
+
+def route_query_params(request: Request) -> set:
+    route = request.scope.get("route")
+    dependant = getattr(route, "dependant", None)
+    if dependant is None:
+        return set()
+    key = id(route)
+    if key not in _route_params_cache:
+        _route_params_cache[key] = _declared_query_params(dependant, set())
+    return _route_params_cache[key]
+
+
+def reject_unknown_params(request: Request, allowed: set):
+    unknown = sorted(set(request.query_params.keys()) - allowed)
+    if unknown:
+        raise bad_request(f"Unknown query parameters: {', '.join(unknown)}")
+
+
+class FilterSet:
+    """Dependência declarativa de filtros e ordenação para uma listagem.
+
+    ``filters`` mapeia nome do parâmetro -> coluna; ``default_ops`` define o
+    operador usado quando não há sufixo (padrão ``eq``, ou ``in`` quando o
+    parâmetro é repetido). ``sortable`` lista as colunas aceitas em
+    ``?sort=-start_date,name``. A chave primária entra sempre como desempate.
+    """
+
+    def __init__(self, model, filters: Dict[str, Any], sortable: Sequence[str] = (), default_ops: Optional[Dict[str, str]] = None):
+        self.model = model
+        self.filters = filters
+        self.default_ops = default_ops or {}
+        self.sortable = {name: model.__table__.c[name] for name in sortable}
+        self.pk = model.__mapper__.primary_key[0]
+        self.__signature__ = self._signature()
+
+    def _signature(self) -> inspect.Signature:
+        params = [
+            inspect.Parameter("request", inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=Request),
+            inspect.Parameter(
+                "sort", inspect.Parameter.KEYWORD_ONLY, annotation=Optional[str],
+                default=Query(None, description=f"Campos separados por vírgula, '-' para decrescente: {', '.join(self.sortable)}"),
+            ),
+        ]
+        for name in self.filters:
+            params.append(inspect.Parameter(
+                name, inspect.Parameter.KEYWORD_ONLY, annotation=Optional[List[str]],
+                default=Query(None, description=f"Sufixos aceitos: {', '.join('__' + op for op in OPERATORS[1:])}"),
+            ))
+        return inspect.Signature(params)
+
+    def allowed_params(self) -> set:
+        names = set(self.filters)
+        for name in self.filters:
+            names.update(f"{name}__{op}" for op in OPERATORS)
+        return names
+
+    def _convert(self, name: str, column, raw: str):
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return raw
+        try:
+            if python_type is datetime:
+                return datetime.fromisoformat(raw)
+            if python_type is date:
+                return date.fromisoformat(raw)
+            return python_type(raw)
+        except ValueError:
+            raise bad_request(f"Invalid value for {name}: {raw!r}")
+
+    def _condition(self, name: str, op: str, raw_values: List[str]):
+        column = self.filters[name]
+        if op == "in":
+            values = [v for raw in raw_values for v in raw.split(",") if v != ""]
+            return column.in_([self._convert(name, column, v) for v in values])
+        if op == "eq" and len(raw_values) > 1:
+            return column.in_([self._convert(name, column, v) for v in raw_values])
+        value = raw_values[-1]
+        if op == "contains":
+            if not isinstance(column.type, String):
+                raise bad_request(f"Operator contains not supported for {name}")
+            escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            return column.ilike(f"%{escaped}%", escape="\\")
+        value = self._convert(name, column, value)
+        if op == "gte":
+            return column >= value
+        if op == "lte":
+            return column <= value
+        return column == value
+
+    def _order(self, sort: Optional[str]) -> list:
+        order = []
+        for key in (sort or "").split(","):
+            key = key.strip()
+            if not key:
+                continue
+            descending = key.startswith("-")
+            name = key.lstrip("-+")
+            if name not in self.sortable:
+                raise bad_request(f"Cannot sort by {name!r}")
+            if name == self.pk.key:
+                # Chave única: colunas depois dela não alteram a ordem
+                order.append((self.pk, descending))
+                return order
+            order.append((self.sortable[name], descending))
+        order.append((self.pk, False))
+        return order
+
+    async def __call__(self, request: Request, sort: Optional[str] = None, **_declared) -> ListQuery:
+        reject_unknown_params(request, route_query_params(request) | self.allowed_params())
+        conditions = []
+        for key in request.query_params.keys():
+            name, _, op = key.partition("__")
+            if name not in self.filters:
+                continue
+            op = op or self.default_ops.get(name, "eq")
+            conditions.append(self._condition(name, op, request.query_params.getlist(key)))
+        return ListQuery(conditions=conditions, order=self._order(sort))
@@ -0,0 +1,188 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+from passlib.context import CryptContext
+
+# bcrypt libera o GIL, então threads bastam na maioria dos casos;
+# HASH_POOL=process isola o custo de CPU em outros processos.
+HASH_POOL = os.getenv("HASH_POOL", "thread").lower()
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Operações aguardando ou executando; acima disso a requisição falha com 503
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", "64"))
+
+# Importação de roster (CSV): hashes em lote em processos, um por núcleo
+IMPORT_HASH_WORKERS = int(os.getenv("IMPORT_HASH_WORKERS", str(os.cpu_count() or 1)))
+
+# Custo do bcrypt; calibre por máquina com `python -m app.hashing calibrate`.
+# Hashes com custo diferente são refeitos no próximo login bem-sucedido.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+
+def build_context(rounds: int = BCRYPT_ROUNDS) -> CryptContext:
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+pwd_context = build_context()
+
+
+class HashQueueFull(Exception):
+    pass
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _hash_many(passwords: list) -> list:
+    return [pwd_context.hash(password) for password in passwords]
+
+
+def _verify(password: str, hashed: str) -> bool:
+    return pwd_context.verify(password, hashed)
+
+
+def needs_rehash(hashed: str) -> bool:
+    return pwd_context.needs_update(hashed)
+
+
+class _OperationStats:
+    def __init__(self):
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "latency_avg_ms": round(self.latency_total / self.completed * 1000, 3) if self.completed else 0.0,
+            "latency_max_ms": round(self.latency_max * 1000, 3),
+        }
+
+
+class HashPool:
+    def __init__(self, workers: int = HASH_WORKERS, queue_limit: int = HASH_QUEUE_LIMIT, kind: str = HASH_POOL):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.kind = kind
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {"hash": _OperationStats(), "verify": _OperationStats()}
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, operation: str, fn, *args):
+        stats = self._stats[operation]
+        if self._pending >= self.queue_limit:
+            stats.rejected += 1
+            raise HashQueueFull(operation)
+        self._pending += 1
+        stats.pending += 1
+        start = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._pending -= 1
+            stats.pending -= 1
+            stats.completed += 1
+            stats.latency_total += elapsed
+            if elapsed > stats.latency_max:
+                stats.latency_max = elapsed
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", _hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run("verify", _verify, password, hashed)
+
+    async def hash_many(self, passwords: list) -> list:
+        """Divide a lista em uma fatia por worker; cada fatia conta como uma operação."""
+        if not passwords:
+            return []
+        size = -(-len(passwords) // self.workers)
+        chunks = [passwords[i:i + size] for i in range(0, len(passwords), size)]
+        hashed = await asyncio.gather(*(self._run("hash", _hash_many, chunk) for chunk in chunks))
+        return [value for chunk in hashed for value in chunk]
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "queue_depth": self._pending,
+            **{operation: stats.snapshot() for operation, stats in self._stats.items()},
+        }
+
+
+hash_pool = HashPool()
+import_hash_pool = HashPool(workers=IMPORT_HASH_WORKERS, queue_limit=IMPORT_HASH_WORKERS * 4, kind="process")
+
+
+def measure(rounds: int, samples: int = 3) -> float:
+    context = build_context(rounds)
+    best = float("inf")
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.hash("calibration-password")
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def calibrate(target_ms: float, min_rounds: int = 10, max_rounds: int = 16, samples: int = 3) -> tuple:
+    """Maior custo cujo hash fica dentro de target_ms nesta máquina (nunca abaixo de min_rounds)."""
+    chosen, timings = min_rounds, {}
+    for rounds in range(min_rounds, max_rounds + 1):
+        timings[rounds] = measure(rounds, samples)
+        if timings[rounds] > target_ms:
+            break
+        chosen = rounds
+    return chosen, timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.hashing")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cmd = sub.add_parser("calibrate", help="mede o custo do bcrypt e sugere BCRYPT_ROUNDS")
+    cmd.add_argument("--target-ms", type=float, default=250.0)
+    cmd.add_argument("--min-rounds", type=int, default=10)
+    cmd.add_argument("--max-rounds", type=int, default=16)
+    cmd.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rounds, timings = calibrate(args.target_ms, args.min_rounds, args.max_rounds, args.samples)
+    for cost, elapsed in timings.items():
+        print(f"rounds={cost:2d}  {elapsed:8.1f} ms", file=sys.stderr)
+    print(f"BCRYPT_ROUNDS={rounds}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import os
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from sqlalchemy import select, text
+from sqlalchemy.orm import configure_mappers
+from . import models, database, portfolio
+from .hashing import hash_pool, import_hash_pool, pwd_context
+from .routers import auth
+
+logger = logging.getLogger("app.startup")
+
+DB_WARMUP_CONNECTIONS = int(os.getenv("DB_WARMUP_CONNECTIONS", str(database.DB_POOL_SIZE)))
+
+MODELS = [
+    models.User,
+    models.Professor,
+    models.Estudante,
+    models.ONG,
+    models.Disciplina,
+    models.Projeto,
+    models.Task,
+    models.MatriculaProjetos,
+    models.TaskEstudante,
+]
+
+
+def hot_statements():
+    # Busca por chave primária e listagem de cada modelo, mais o lookup de
+    # get_current_user; executá-las aquece o cache de compilação do SQLAlchemy
+    # e os prepared statements do asyncpg em cada conexão aberta.
+    statements = [select(models.User).where(models.User.username == "")]
+    for model in MODELS:
+        pk = model.__mapper__.primary_key[0]
+        statements.append(select(model).where(pk == -1))
+        statements.append(select(model).limit(1))
+    return statements
+
+
+async def _warm_connection(target, statements):
+    async with target.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        for statement in statements:
+            await conn.execute(statement)
+
+
+async def warm_pool(target, connections: int):
+    if connections <= 0:
+        return
+    statements = hot_statements()
+    # As conexões são abertas em paralelo para que o pool realmente cresça até N
+    await asyncio.gather(*(_warm_connection(target, statements) for _ in range(connections)))
+
+
+def warmup_connections(requested: int) -> int:
+    # Acima de pool_size + max_overflow as conexões extras esperariam pool_timeout e falhariam
+    capacity = database.DB_POOL_SIZE + database.DB_MAX_OVERFLOW
+    if requested > capacity:
+        logger.warning("DB_WARMUP_CONNECTIONS=%s exceeds pool capacity %s; warming %s", requested, capacity, capacity)
+        return capacity
+    return requested
+
+
+async def load_revocation_list():
+    async with database.AsyncSessionLocal() as session:
+        await auth.revocation_list.load(session)
+
+
+def start_portfolio_refresher():
+    # Views materializadas (01-schema.sql) só existem no Postgres; no sqlite os portfolios são calculados na hora
+    if database.engine.dialect.name != "postgresql":
+        return
+    portfolio.refresher.start(database.engine)
+
+
+async def _timed(timings: dict, name: str, step):
+    start = time.perf_counter()
+    try:
+        result = step()
+        if asyncio.iscoroutine(result):
+            await result
+    except Exception as exc:
+        logger.warning("startup step %s failed: %s", name, exc)
+        timings[name] = {"ms": round((time.perf_counter() - start) * 1000, 3), "error": str(exc)}
+        return
+    timings[name] = {"ms": round((time.perf_counter() - start) * 1000, 3)}
+
+
+async def warm_up(app: FastAPI) -> dict:
+    timings = {}
+    start = time.perf_counter()
+    await _timed(timings, "configure_mappers", configure_mappers)
+    await _timed(timings, "bcrypt_backend", lambda: pwd_context.handler("bcrypt").get_backend())
+    connections = warmup_connections(DB_WARMUP_CONNECTIONS)
+    await _timed(timings, "pool", lambda: warm_pool(database.engine, connections))
+    if database.read_engine is not database.engine:
+        await _timed(timings, "read_pool", lambda: warm_pool(database.read_engine, connections))
+    await _timed(timings, "revocation_list", load_revocation_list)
+    await _timed(timings, "portfolio_refresher", start_portfolio_refresher)
+    await _timed(timings, "openapi", app.openapi)
+    timings["total"] = {"ms": round((time.perf_counter() - start) * 1000, 3)}
+    logger.info("startup warm-up: %s", timings)
+    return timings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.startup_timings = await warm_up(app)
+    yield
+    await portfolio.refresher.stop()
+    hash_pool.shutdown()
+    import_hash_pool.shutdown()
+    await database.engine.dispose()
+    if database.read_engine is not database.engine:
+        await database.read_engine.dispose()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, Float, String, Text, Date, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql import func
 
@@ -13,6 +13,8 @@ class User(Base):
     role = Column(String(50), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Tokens emitidos antes disso deixam de valer (troca de senha ou papel; username/email com claims stateless)
+    tokens_valid_after = Column(DateTime(timezone=True), index=True)
     professor = relationship("Professor", uselist=False, back_populates="user")
     estudante = relationship("Estudante", uselist=False, back_populates="user")
 
@@ -33,8 +35,8 @@ class Estudante(Base):
     student_id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("User.user_id", ondelete="CASCADE"), unique=True, nullable=False)
     full_name = Column(String(255), nullable=False)
-    vinculo = Column(String(255))
-    curso = Column(String(255))
+    vinculo = Column(String(255), index=True)
+    curso = Column(String(255), index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     user = relationship("User", back_populates="estudante")
@@ -72,7 +74,7 @@ class Projeto(Base):
     description = Column(Text)
     start_date = Column(Date)
     end_date = Column(Date)
-    status = Column(String(50))
+    status = Column(String(50), index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     disciplina = relationship("Disciplina", back_populates="projetos")
@@ -87,7 +89,7 @@ class Task(Base):
     name = Column(String(255), nullable=False)
     description = Column(Text)
     type = Column(String(50))
-    status = Column(String(50))
+    status = Column(String(50), index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     projeto = relationship("Projeto", back_populates="tasks")
@@ -119,4 +121,25 @@ class TaskEstudante(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     estudante = relationship("Estudante", back_populates="task_estudantes")
     task = relationship("Task", back_populates="task_estudantes")
-    __table_args__ = (UniqueConstraint('student_id', 'task_id', name='_student_task_uc'),) 
\ No newline at end of file
+    __table_args__ = (
+        UniqueConstraint('student_id', 'task_id', name='_student_task_uc'),
+        # Tarefas de um estudante ordenadas por prazo (GET /estudantes/{id}/overview)
+        Index('idx_task_estudante_student_deadline', 'student_id', 'deadline_date'),
+        # Contagens por status com janela de datas (GET /stats)
+        Index('idx_task_estudante_status_assigned', 'status', 'assigned_date'),
+    )
+
+class ImportReport(Base):
+    # Linhas rejeitadas de POST /users/import, em CSV, até expires_at
+    __tablename__ = "Import_report"
+    report_id = Column(String(32), primary_key=True)
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+class ThrottleBucket(Base):
+    # Token buckets do login compartilhados entre workers (THROTTLE_BACKEND=database)
+    __tablename__ = "Throttle_bucket"
+    bucket_key = Column(String(255), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(Float, nullable=False, index=True)  # epoch em segundos
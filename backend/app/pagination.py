@@ -0,0 +1,210 @@
+import os
+import json
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import and_, any_, false, literal, or_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from .counting import set_total_count
+from .projection import Projection
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# ?ids=1,2,3: busca em lote por chave primária
+MAX_BATCH_IDS = int(os.getenv("MAX_BATCH_IDS", "100"))
+MISSING_IDS_HEADER = "X-Missing-Ids"
+
+# Ordenação de uma listagem: pares (coluna, descendente). A última coluna deve
+# ser única (a chave primária) para que o cursor identifique uma posição exata.
+Ordering = Sequence[Tuple[Any, bool]]
+
+
+@dataclass
+class PageParams:
+    cursor: Optional[str]
+    limit: int
+    skip: int
+    count: bool = False
+
+
+def page_params(
+    cursor: Optional[str] = Query(None, description="Cursor opaco devolvido no cabeçalho X-Next-Cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0, description="Obsoleto: prefira cursor (OFFSET fica mais lento a cada página)"),
+    count: bool = Query(False, description="Inclui o total no cabeçalho X-Total-Count (exato ou estimado, ver X-Total-Count-Source)"),
+) -> PageParams:
+    return PageParams(cursor=cursor, limit=limit, skip=skip, count=count)
+
+
+def primary_key_order(model) -> List[Tuple[Any, bool]]:
+    return [(model.__mapper__.primary_key[0], False)]
+
+
+def _invalid_cursor():
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _ordering_signature(order: Ordering) -> List[str]:
+    return [("-" if descending else "") + column.key for column, descending in order]
+
+
+def _encode_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(column, value):
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(row, order: Ordering) -> str:
+    payload = {
+        "k": _ordering_signature(order),
+        "v": [_encode_value(getattr(row, column.key)) for column, _ in order],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order: Ordering) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = payload["v"]
+        if payload["k"] != _ordering_signature(order) or len(values) != len(order):
+            raise ValueError("cursor does not match ordering")
+        return [_decode_value(column, value) for (column, _), value in zip(order, values)]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise _invalid_cursor()
+
+
+def _after(column, descending: bool, value):
+    # NULLs sempre ao final (nulls_last), em qualquer direção
+    if value is None:
+        return false()
+    comparison = column < value if descending else column > value
+    if column.nullable:
+        return or_(comparison, column.is_(None))
+    return comparison
+
+
+def _equal(column, value):
+    return column.is_(None) if value is None else column == value
+
+
+def _order_clause(column, descending: bool):
+    clause = column.desc() if descending else column.asc()
+    return clause.nulls_last() if column.nullable else clause
+
+
+def keyset_filter(order: Ordering, values: list):
+    # (a, b, pk) > (va, vb, vpk) expandido para suportar direções mistas e NULLs
+    branches = []
+    for i, (column, descending) in enumerate(order):
+        prefix = [_equal(col, val) for (col, _), val in zip(order[:i], values[:i])]
+        branches.append(and_(*prefix, _after(column, descending, values[i])))
+    return or_(*branches)
+
+
+def paginate(stmt: Select, page: PageParams, order: Ordering) -> Select:
+    stmt = stmt.order_by(*(_order_clause(column, descending) for column, descending in order))
+    if page.cursor:
+        stmt = stmt.where(keyset_filter(order, decode_cursor(page.cursor, order)))
+    elif page.skip:
+        stmt = stmt.offset(page.skip)
+    # Uma linha a mais indica se existe próxima página
+    return stmt.limit(page.limit + 1)
+
+
+def finish_page(rows: Sequence, page: PageParams, order: Ordering, response: Response) -> list:
+    rows = list(rows)
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1], order)
+    return rows
+
+
+def ids_param(
+    ids: Optional[str] = Query(None, description=f"Chaves primárias separadas por vírgula (máximo {MAX_BATCH_IDS}); ignora a paginação"),
+) -> Optional[List[int]]:
+    if ids is None:
+        return None
+    try:
+        values = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid ids")
+    values = list(dict.fromkeys(values))
+    if len(values) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_IDS} ids per request",
+        )
+    return values
+
+
+def match_ids(column, ids: List[int], dialect_name: str):
+    if dialect_name == "postgresql":
+        # Um único parâmetro array: o mesmo prepared statement para qualquer quantidade de ids
+        return column == any_(literal(ids, ARRAY(column.type)))
+    return column.in_(ids)
+
+
+async def fetch_by_ids(
+    db: AsyncSession,
+    stmt: Select,
+    ids: List[int],
+    response: Response,
+    fields: Optional[Projection] = None,
+):
+    model = stmt.column_descriptions[0]["entity"]
+    pk = model.__mapper__.primary_key[0]
+    stmt = stmt.where(match_ids(pk, ids, db.get_bind().dialect.name))
+    if fields is not None:
+        stmt = fields.apply(stmt, [(pk, False)])
+    result = await db.execute(stmt)
+    by_id = {getattr(row, pk.key): row for row in result.scalars().all()}
+    # Mesma ordem do pedido; ids inexistentes vão no cabeçalho
+    rows = [by_id[i] for i in ids if i in by_id]
+    missing = [str(i) for i in ids if i not in by_id]
+    if missing:
+        response.headers[MISSING_IDS_HEADER] = ",".join(missing)
+    return fields.render(rows, response) if fields is not None else rows
+
+
+async def fetch_page(
+    db: AsyncSession,
+    stmt: Select,
+    page: PageParams,
+    order: Ordering,
+    response: Response,
+    fields: Optional[Projection] = None,
+    ids: Optional[List[int]] = None,
+):
+    if ids is not None:
+        return await fetch_by_ids(db, stmt, ids, response, fields)
+    if page.count:
+        await set_total_count(db, stmt, response)
+    if fields is not None:
+        stmt = fields.apply(stmt, order)
+    result = await db.execute(paginate(stmt, page, order))
+    rows = finish_page(result.scalars().all(), page, order, response)
+    return fields.render(rows, response) if fields is not None else rows
@@ -0,0 +1,250 @@
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, case, distinct, event, func, select, text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from . import database, models, schemas
+from .reports import COMPLETED_ASSIGNMENT_STATUS, COMPLETED_TASK_STATUS
+
+logger = logging.getLogger("app.portfolio")
+
+# Intervalo máximo entre refreshes e intervalo mínimo quando há escritas pendentes
+PORTFOLIO_REFRESH_SECONDS = float(os.getenv("PORTFOLIO_REFRESH_SECONDS", "300"))
+PORTFOLIO_MIN_REFRESH_SECONDS = float(os.getenv("PORTFOLIO_MIN_REFRESH_SECONDS", "10"))
+
+# Escritas nessas tabelas deixam os portfolios desatualizados
+TRACKED_MODELS = (
+    models.Professor,
+    models.ONG,
+    models.Disciplina,
+    models.Projeto,
+    models.Task,
+    models.MatriculaProjetos,
+    models.TaskEstudante,
+)
+
+
+def _project_owners(kind: str):
+    if kind == "professor":
+        return (
+            select(models.Projeto.projeto_id, models.Disciplina.professor_id.label("owner_id"))
+            .join(models.Disciplina, models.Disciplina.disciplina_id == models.Projeto.disciplina_id)
+            .subquery()
+        )
+    return select(models.Projeto.projeto_id, models.Projeto.ngo_id.label("owner_id")).subquery()
+
+
+def portfolio_query(kind: str):
+    """Agregados por professor (via Disciplina) ou ONG (via Projeto), uma linha por dono."""
+    owners = _project_owners(kind)
+    owner_pk = models.Professor.professor_id if kind == "professor" else models.ONG.ngo_id
+    te = models.TaskEstudante
+
+    # Um subselect por métrica evita multiplicar matrículas por tarefas no mesmo JOIN
+    projects = (
+        select(owners.c.owner_id, func.count().label("projects"))
+        .group_by(owners.c.owner_id)
+        .subquery()
+    )
+    students = (
+        select(owners.c.owner_id, func.count(distinct(models.MatriculaProjetos.student_id)).label("students"))
+        .join(models.MatriculaProjetos, models.MatriculaProjetos.projeto_id == owners.c.projeto_id)
+        .group_by(owners.c.owner_id)
+        .subquery()
+    )
+    open_task = func.coalesce(models.Task.status, "") != COMPLETED_TASK_STATUS
+    overdue = (te.deadline_date < func.current_date()) & (func.coalesce(te.status, "") != COMPLETED_ASSIGNMENT_STATUS)
+    tasks = (
+        select(
+            owners.c.owner_id,
+            func.count(distinct(case((open_task, models.Task.task_id)))).label("open_tasks"),
+            func.count(case((overdue, te.estud_task_id))).label("overdue_assignments"),
+        )
+        .join(models.Task, models.Task.projeto_id == owners.c.projeto_id)
+        .outerjoin(te, te.task_id == models.Task.task_id)
+        .group_by(owners.c.owner_id)
+        .subquery()
+    )
+    return (
+        select(
+            owner_pk.label("owner_id"),
+            func.coalesce(projects.c.projects, 0).label("projects"),
+            func.coalesce(students.c.students, 0).label("students"),
+            func.coalesce(tasks.c.open_tasks, 0).label("open_tasks"),
+            func.coalesce(tasks.c.overdue_assignments, 0).label("overdue_assignments"),
+            func.now().label("refreshed_at"),
+        )
+        .outerjoin(projects, projects.c.owner_id == owner_pk)
+        .outerjoin(students, students.c.owner_id == owner_pk)
+        .outerjoin(tasks, tasks.c.owner_id == owner_pk)
+    )
+
+
+_views_metadata = MetaData()
+
+
+def _view_table(name: str) -> Table:
+    return Table(
+        name,
+        _views_metadata,
+        Column("owner_id", Integer, primary_key=True),
+        Column("projects", Integer),
+        Column("students", Integer),
+        Column("open_tasks", Integer),
+        Column("overdue_assignments", Integer),
+        Column("refreshed_at", DateTime(timezone=True)),
+    )
+
+
+VIEWS = {
+    "professor": _view_table("professor_portfolio"),
+    "ong": _view_table("ong_portfolio"),
+}
+
+
+def _as_portfolio(row, source: str) -> schemas.Portfolio:
+    refreshed_at = row.refreshed_at
+    if isinstance(refreshed_at, str):
+        refreshed_at = datetime.fromisoformat(refreshed_at)
+    if refreshed_at.tzinfo is None:
+        refreshed_at = refreshed_at.replace(tzinfo=timezone.utc)
+    stale = max(0.0, (datetime.now(timezone.utc) - refreshed_at).total_seconds())
+    return schemas.Portfolio(
+        owner_id=row.owner_id,
+        projects=row.projects,
+        students=row.students,
+        open_tasks=row.open_tasks,
+        overdue_assignments=row.overdue_assignments,
+        refreshed_at=refreshed_at,
+        stale_seconds=round(stale, 3),
+        source=source,
+    )
+
+
+async def read_portfolio(db: AsyncSession, kind: str, owner_id: int) -> Optional[schemas.Portfolio]:
+    if db.get_bind().dialect.name == "postgresql":
+        view = VIEWS[kind]
+        try:
+            # Savepoint: sem ele o erro abortaria a transação da consulta ao vivo
+            async with db.begin_nested():
+                row = (await db.execute(select(view).where(view.c.owner_id == owner_id))).first()
+        except ProgrammingError as exc:
+            if database.sqlstate(exc) != database.UNDEFINED_TABLE:
+                raise
+            logger.warning("portfolio view %s missing (see 01-schema.sql); computing live", view.name)
+            row = None
+        if row is not None:
+            return _as_portfolio(row, "materialized")
+    # Sem a view (sqlite ou schema antigo) ou dono criado depois do último refresh: calcula na hora
+    owner_pk = models.Professor.professor_id if kind == "professor" else models.ONG.ngo_id
+    row = (await db.execute(portfolio_query(kind).where(owner_pk == owner_id))).first()
+    return _as_portfolio(row, "live") if row is not None else None
+
+
+class PortfolioRefresher:
+    """Refresh periódico das views, antecipado quando há escritas.
+
+    O flag ``dirty`` é do processo: com vários workers só o worker que tratou
+    a escrita antecipa o refresh; nos demais a view é atualizada no intervalo
+    normal (PORTFOLIO_REFRESH_SECONDS).
+    """
+
+    def __init__(self, interval: float = PORTFOLIO_REFRESH_SECONDS, min_interval: float = PORTFOLIO_MIN_REFRESH_SECONDS):
+        self.interval = interval
+        self.min_interval = min_interval
+        self.dirty = False
+        self.refreshes = 0
+        self.failures = 0
+        self.last_refresh: Optional[float] = None
+        self.last_duration_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    def due(self, now: float) -> bool:
+        if self.last_refresh is None:
+            return True
+        elapsed = now - self.last_refresh
+        return elapsed >= self.interval or (self.dirty and elapsed >= self.min_interval)
+
+    async def refresh(self, engine: AsyncEngine):
+        start = time.monotonic()
+        self.dirty = False
+        try:
+            async with engine.begin() as conn:
+                for view in VIEWS.values():
+                    await conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view.name}"))
+        except Exception as exc:
+            self.failures += 1
+            self.dirty = True
+            logger.warning("portfolio refresh failed: %s", exc)
+            return
+        self.refreshes += 1
+        self.last_refresh = time.monotonic()
+        self.last_duration_ms = round((self.last_refresh - start) * 1000, 3)
+
+    async def _run(self, engine: AsyncEngine):
+        while True:
+            if self.due(time.monotonic()):
+                await self.refresh(engine)
+            await asyncio.sleep(min(self.min_interval, self.interval))
+
+    def start(self, engine: AsyncEngine):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(engine))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "dirty": self.dirty,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "seconds_since_refresh": round(time.monotonic() - self.last_refresh, 3) if self.last_refresh else None,
+            "last_duration_ms": self.last_duration_ms,
+        }
+
+
+refresher = PortfolioRefresher()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_writes(session, flush_context):
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, TRACKED_MODELS):
+            session.info["portfolio_dirty"] = True
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statements(orm_execute_state):
+    # INSERT/UPDATE/DELETE ... RETURNING (repository, bulk) não passam pelo flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and issubclass(mapper.class_, TRACKED_MODELS):
+            orm_execute_state.session.info["portfolio_dirty"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_dirty_on_commit(session):
+    if session.info.pop("portfolio_dirty", False):
+        refresher.mark_dirty()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("portfolio_dirty", None)
@@ -0,0 +1,115 @@
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from fastapi import Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import ConfigDict, create_model
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from sqlalchemy.sql import Select
+from .errors import bad_request
+
+# Relacionamento expandido: (nome, schema aninhado, é lista)
+Expansion = Tuple[str, type, bool]
+
+
+@lru_cache(maxsize=None)
+def shaped_schema(schema: type, names: Tuple[str, ...], expand: Tuple[Expansion, ...] = ()) -> type:
+    fields = {name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in names}
+    for name, nested, many in expand:
+        fields[name] = (List[nested], []) if many else (Optional[nested], None)
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **fields,
+    )
+
+
+class Projection:
+    def __init__(self, model, schema: type, names: Optional[Tuple[str, ...]] = None, expand: Tuple[Expansion, ...] = ()):
+        self.model = model
+        self.schema = schema
+        self.names = names
+        self.expand = expand
+
+    @property
+    def narrowed(self) -> bool:
+        return self.names is not None
+
+    @property
+    def shaped(self) -> bool:
+        return self.narrowed or bool(self.expand)
+
+    def options(self, order=()) -> list:
+        """Opções de carga: colunas pedidas (mais as da ordenação/cursor) e relacionamentos expandidos."""
+        options = []
+        if self.narrowed:
+            columns = self.model.__mapper__.columns
+            keys = [name for name in self.names if name in columns]
+            keys += [column.key for column, _ in order if column.key not in keys]
+            # raiseload: um atributo fora da lista falha em vez de virar lazy load
+            options.append(load_only(*(getattr(self.model, key) for key in keys), raiseload=True))
+        for name, _, many in self.expand:
+            # *-para-um entra no mesmo SELECT (JOIN); coleções usam uma query IN por página
+            strategy = selectinload if many else joinedload
+            options.append(strategy(getattr(self.model, name)))
+        return options
+
+    def apply(self, stmt: Select, order=()) -> Select:
+        return stmt.options(*self.options(order))
+
+    def render(self, content, response: Optional[Response] = None):
+        if not self.shaped:
+            return content
+        names = self.names if self.narrowed else tuple(self.schema.model_fields)
+        schema = shaped_schema(self.schema, names, self.expand)
+        if isinstance(content, (list, tuple)):
+            data = [schema.model_validate(item) for item in content]
+        else:
+            data = schema.model_validate(content)
+        # Ao devolver a resposta pronta, os cabeçalhos definidos em `response` precisam ir junto
+        headers = dict(response.headers) if response is not None else None
+        return JSONResponse(content=jsonable_encoder(data), headers=headers)
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+class FieldSet:
+    """Dependência ``?fields=id,name&expand=ong`` para os endpoints de leitura de um modelo.
+
+    Sem parâmetros a resposta segue o ``response_model`` completo e nenhum
+    relacionamento é carregado. ``expandable`` mapeia relacionamento -> schema
+    do objeto aninhado. A chave primária é sempre incluída.
+    """
+
+    def __init__(self, model, schema: type, expandable: Optional[Dict[str, type]] = None):
+        self.model = model
+        self.schema = schema
+        self.pk = model.__mapper__.primary_key[0].key
+        relationships = model.__mapper__.relationships
+        self.expandable = {
+            name: (name, nested, relationships[name].uselist)
+            for name, nested in (expandable or {}).items()
+        }
+
+    def __call__(
+        self,
+        fields: Optional[str] = Query(None, description="Campos da resposta separados por vírgula; a chave primária é sempre incluída"),
+        expand: Optional[str] = Query(None, description="Relacionamentos a incluir na resposta, separados por vírgula"),
+    ) -> Projection:
+        names = None
+        if fields:
+            requested = _split(fields)
+            unknown = sorted(set(requested) - set(self.schema.model_fields))
+            if unknown:
+                raise bad_request(f"Unknown fields: {', '.join(unknown)}")
+            names = [self.pk] if self.pk in self.schema.model_fields else []
+            names += [name for name in self.schema.model_fields if name in requested and name != self.pk]
+            names = tuple(names)
+        requested = _split(expand)
+        unknown = sorted(set(requested) - set(self.expandable))
+        if unknown:
+            raise bad_request(f"Cannot expand: {', '.join(unknown)}")
+        expansions = tuple(self.expandable[name] for name in self.expandable if name in requested)
+        return Projection(self.model, self.schema, names, expansions)
@@ -0,0 +1,151 @@
+from datetime import date, timedelta
+from typing import Optional
+from sqlalchemy import and_, case, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import joinedload
+from . import models, schemas
+
+# Valores de status usados em 01-schema.sql / 02-populate.sql
+COMPLETED_ASSIGNMENT_STATUS = "Concluída"
+COMPLETED_TASK_STATUS = "Concluída"
+ACTIVE_ENROLLMENT_STATUS = "Ativo"
+NO_STATUS = "Sem status"
+
+
+def overdue_assignment(today: date):
+    return and_(
+        models.TaskEstudante.deadline_date < today,
+        or_(
+            models.TaskEstudante.status.is_(None),
+            models.TaskEstudante.status != COMPLETED_ASSIGNMENT_STATUS,
+        ),
+    )
+
+
+async def project_dashboard(db: AsyncSession, projeto_id: int, today: Optional[date] = None) -> Optional[schemas.ProjetoDashboard]:
+    """Projeto com ONG/disciplina, tarefas com contagens por status e estudantes matriculados.
+
+    Sempre três queries, independente do número de tarefas ou estudantes.
+    """
+    today = today or date.today()
+    projeto = (await db.execute(
+        select(models.Projeto)
+        .options(joinedload(models.Projeto.ong), joinedload(models.Projeto.disciplina))
+        .where(models.Projeto.projeto_id == projeto_id)
+    )).scalars().first()
+    if projeto is None:
+        return None
+
+    te = models.TaskEstudante
+    task_rows = await db.execute(
+        select(
+            models.Task.task_id,
+            models.Task.name,
+            models.Task.type,
+            models.Task.status,
+            te.status.label("assignment_status"),
+            func.count(te.estud_task_id).label("assignments"),
+            func.coalesce(func.sum(case((overdue_assignment(today), 1), else_=0)), 0).label("overdue"),
+        )
+        .outerjoin(te, te.task_id == models.Task.task_id)
+        .where(models.Task.projeto_id == projeto_id)
+        .group_by(models.Task.task_id, models.Task.name, models.Task.type, models.Task.status, te.status)
+        .order_by(models.Task.task_id)
+    )
+    tasks = {}
+    for row in task_rows:
+        task = tasks.get(row.task_id)
+        if task is None:
+            task = tasks[row.task_id] = schemas.TaskSummary(
+                task_id=row.task_id, name=row.name, type=row.type, status=row.status
+            )
+        if row.assignments:
+            task.assignments[row.assignment_status or NO_STATUS] = row.assignments
+            task.overdue += row.overdue
+
+    student_rows = await db.execute(
+        select(
+            models.MatriculaProjetos.matricula_id,
+            models.MatriculaProjetos.status,
+            models.MatriculaProjetos.matricula_date,
+            models.Estudante.student_id,
+            models.Estudante.full_name,
+            models.Estudante.curso,
+        )
+        .join(models.Estudante, models.Estudante.student_id == models.MatriculaProjetos.student_id)
+        .where(models.MatriculaProjetos.projeto_id == projeto_id)
+        .order_by(models.Estudante.full_name, models.MatriculaProjetos.matricula_id)
+    )
+
+    return schemas.ProjetoDashboard(
+        projeto=schemas.ProjetoRead.model_validate(projeto),
+        ong=schemas.ONGRead.model_validate(projeto.ong) if projeto.ong else None,
+        disciplina=schemas.DisciplinaRead.model_validate(projeto.disciplina) if projeto.disciplina else None,
+        tasks=list(tasks.values()),
+        estudantes=[schemas.EnrolledStudent.model_validate(row) for row in student_rows],
+        overdue_assignments=sum(task.overdue for task in tasks.values()),
+    )
+
+
+async def student_overview(db: AsyncSession, student_id: int, days: int, today: Optional[date] = None) -> Optional[schemas.EstudanteOverview]:
+    """Matrículas ativas, tarefas atribuídas e prazos dos próximos ``days`` dias de um estudante.
+
+    As atribuições vêm em uma única query ordenada por prazo, que usa o índice
+    (student_id, deadline_date); os próximos prazos são um recorte dela.
+    """
+    today = today or date.today()
+    estudante = (await db.execute(
+        select(models.Estudante).where(models.Estudante.student_id == student_id)
+    )).scalars().first()
+    if estudante is None:
+        return None
+
+    enrollment_rows = await db.execute(
+        select(
+            models.MatriculaProjetos.matricula_id,
+            models.MatriculaProjetos.projeto_id,
+            models.Projeto.name.label("projeto_name"),
+            models.MatriculaProjetos.status,
+            models.MatriculaProjetos.matricula_date,
+        )
+        .join(models.Projeto, models.Projeto.projeto_id == models.MatriculaProjetos.projeto_id)
+        .where(
+            models.MatriculaProjetos.student_id == student_id,
+            models.MatriculaProjetos.status == ACTIVE_ENROLLMENT_STATUS,
+        )
+        .order_by(models.MatriculaProjetos.matricula_date.desc(), models.MatriculaProjetos.matricula_id)
+    )
+
+    te = models.TaskEstudante
+    assignment_rows = await db.execute(
+        select(
+            te.estud_task_id,
+            te.task_id,
+            models.Task.name.label("task_name"),
+            models.Task.projeto_id,
+            models.Projeto.name.label("projeto_name"),
+            te.status,
+            te.assigned_date,
+            te.deadline_date,
+        )
+        .join(models.Task, models.Task.task_id == te.task_id)
+        .join(models.Projeto, models.Projeto.projeto_id == models.Task.projeto_id)
+        .where(te.student_id == student_id)
+        .order_by(te.deadline_date.asc().nulls_last(), te.estud_task_id)
+    )
+    assignments = [schemas.AssignmentSummary.model_validate(row) for row in assignment_rows]
+    horizon = today + timedelta(days=days)
+    upcoming = [
+        a for a in assignments
+        if a.deadline_date is not None
+        and today <= a.deadline_date <= horizon
+        and a.status != COMPLETED_ASSIGNMENT_STATUS
+    ]
+
+    return schemas.EstudanteOverview(
+        estudante=schemas.EstudanteRead.model_validate(estudante),
+        matriculas=[schemas.EnrollmentSummary.model_validate(row) for row in enrollment_rows],
+        assignments=assignments,
+        upcoming_deadlines=upcoming,
+    )
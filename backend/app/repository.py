@@ -0,0 +1,133 @@
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import delete, exists, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import RelationshipDirection
+
+
+@dataclass
+class Reference:
+    """Chave estrangeira validada na escrita: campo, PK do modelo referenciado e erro 404."""
+    field: str
+    column: Any
+    detail: str
+
+
+def _not_found(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+
+
+def _nullified_columns(model) -> list:
+    """FKs que apontam para ``model`` sem ON DELETE e aceitam NULL.
+
+    São as colunas que ``session.delete()`` zerava nos filhos antes de apagar
+    o pai; o DELETE direto faz o mesmo com um UPDATE por coluna.
+    """
+    columns = []
+    for relationship in model.__mapper__.relationships:
+        if relationship.direction is not RelationshipDirection.ONETOMANY or relationship.passive_deletes:
+            continue
+        for column in relationship.remote_side:
+            if column.nullable and all(fk.ondelete is None for fk in column.foreign_keys):
+                columns.append(column)
+    return columns
+
+
+class Repository:
+    """Escritas de um modelo em um único statement com RETURNING.
+
+    ``create`` e ``update`` devolvem a linha gravada sem SELECT nem refresh;
+    referências (``references``) entram como ``WHERE EXISTS`` no mesmo
+    statement e só são consultadas de novo, para montar o 404, quando nenhuma
+    linha é afetada. Violação de UNIQUE vira 400 com ``conflict_detail``, ou
+    sobe como IntegrityError (após o rollback) quando ele não é informado.
+    """
+
+    def __init__(
+        self,
+        model,
+        not_found: str,
+        references: Sequence[Reference] = (),
+        conflict_detail: Optional[str] = None,
+    ):
+        self.model = model
+        self.pk = model.__mapper__.primary_key[0]
+        self.not_found = not_found
+        self.references = references
+        self.conflict_detail = conflict_detail
+        self.nullify = _nullified_columns(model)
+
+    def _references_in(self, values: dict) -> list:
+        return [ref for ref in self.references if values.get(ref.field) is not None]
+
+    @staticmethod
+    def _exists(ref: Reference, values: dict):
+        return exists().where(ref.column == values[ref.field])
+
+    async def _missing_reference(self, db: AsyncSession, refs: list, values: dict) -> Optional[HTTPException]:
+        for ref in refs:
+            if not await db.scalar(select(self._exists(ref, values))):
+                return _not_found(ref.detail)
+        return None
+
+    async def _write(self, db: AsyncSession, stmt):
+        try:
+            return (await db.scalars(stmt.returning(self.model))).first()
+        except IntegrityError:
+            await db.rollback()
+            if self.conflict_detail is None:
+                raise
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=self.conflict_detail)
+
+    async def create(self, db: AsyncSession, data: BaseModel):
+        # None fica de fora, como no ORM: valem os defaults do banco (ex.: matricula_date)
+        values = data.model_dump(exclude_none=True)
+        refs = self._references_in(values)
+        if refs:
+            # INSERT ... SELECT ... WHERE EXISTS: sem a referência nada é inserido
+            row = select(*(literal(value, self.model.__table__.c[key].type).label(key) for key, value in values.items()))
+            stmt = insert(self.model).from_select(list(values), row.where(*(self._exists(ref, values) for ref in refs)))
+        else:
+            stmt = insert(self.model).values(**values)
+        obj = await self._write(db, stmt)
+        if obj is None:
+            error = await self._missing_reference(db, refs, values)
+            await db.rollback()
+            raise error or _not_found(refs[0].detail)
+        await db.commit()
+        return obj
+
+    async def update(self, db: AsyncSession, pk_value, values: dict):
+        if not values:
+            obj = (await db.scalars(select(self.model).where(self.pk == pk_value))).first()
+            if obj is None:
+                raise _not_found(self.not_found)
+            return obj
+        refs = self._references_in(values)
+        stmt = (
+            update(self.model)
+            .where(self.pk == pk_value, *(self._exists(ref, values) for ref in refs))
+            .values(**values)
+        )
+        obj = await self._write(db, stmt)
+        if obj is None:
+            error = None
+            if refs and await db.scalar(select(exists().where(self.pk == pk_value))):
+                error = await self._missing_reference(db, refs, values)
+            await db.rollback()
+            raise error or _not_found(self.not_found)
+        await db.commit()
+        return obj
+
+    async def delete(self, db: AsyncSession, pk_value):
+        for column in self.nullify:
+            await db.execute(update(column.table).where(column == pk_value).values({column.name: None}))
+        deleted = (await db.execute(delete(self.model).where(self.pk == pk_value).returning(self.pk))).scalar()
+        if deleted is None:
+            await db.rollback()
+            raise _not_found(self.not_found)
+        await db.commit()
+        return deleted
@@ -0,0 +1,71 @@
+import time
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from . import models
+
+
+class RevocationList:
+    """Tokens revogados antes da expiração.
+
+    Guarda, por usuário, o instante a partir do qual os tokens emitidos antes
+    dele deixam de valer (troca de senha/papel/exclusão), e um conjunto de
+    jti revogados individualmente. Entradas mais antigas que o tempo de vida
+    de um token são descartadas, então o tamanho fica limitado aos eventos
+    da última janela de expiração.
+    """
+
+    def __init__(self, token_lifetime_seconds: float):
+        self.token_lifetime = token_lifetime_seconds
+        self._user_cutoffs: dict = {}
+        self._tokens: dict = {}
+        self._lock = threading.Lock()
+
+    def revoke_user(self, user_id: int, at: Optional[float] = None):
+        at = time.time() if at is None else at
+        with self._lock:
+            if at > self._user_cutoffs.get(user_id, 0):
+                self._user_cutoffs[user_id] = at
+
+    def revoke_token(self, jti: str, expires_at: float):
+        with self._lock:
+            self._tokens[jti] = expires_at
+
+    def is_revoked(self, payload: dict) -> bool:
+        jti = payload.get("jti")
+        if jti is not None and jti in self._tokens:
+            return True
+        issued_at = payload.get("iat")
+        user_id = payload.get("uid")
+        if issued_at is None or user_id is None:
+            return False
+        cutoff = self._user_cutoffs.get(user_id)
+        return cutoff is not None and issued_at < cutoff
+
+    def prune(self):
+        now = time.time()
+        with self._lock:
+            for user_id in [u for u, at in self._user_cutoffs.items() if now - at > self.token_lifetime]:
+                del self._user_cutoffs[user_id]
+            for jti in [j for j, exp in self._tokens.items() if exp < now]:
+                del self._tokens[jti]
+
+    async def load(self, db: AsyncSession):
+        # Só tokens_valid_after conta: updated_at também muda em escritas que
+        # não mexem nas credenciais (ex.: rehash da senha no login)
+        since = datetime.now(timezone.utc) - timedelta(seconds=self.token_lifetime)
+        result = await db.execute(
+            select(models.User.user_id, models.User.tokens_valid_after)
+            .where(models.User.tokens_valid_after >= since)
+        )
+        for user_id, valid_after in result.all():
+            if valid_after.tzinfo is None:
+                # TIMESTAMPTZ volta com fuso no PostgreSQL; sem fuso (SQLite) é o
+                # valor em UTC gravado pela aplicação
+                valid_after = valid_after.replace(tzinfo=timezone.utc)
+            self.revoke_user(user_id, valid_after.timestamp())
+
+    def stats(self) -> dict:
+        return {"users": len(self._user_cutoffs), "tokens": len(self._tokens)}
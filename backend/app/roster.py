@@ -0,0 +1,192 @@
+import os
+import csv
+import io
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import models, schemas
+from .hashing import HashQueueFull, import_hash_pool
+from .errors import bad_request
+
+# Linhas validadas, hasheadas e gravadas por transação
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+IMPORT_REPORT_TTL_SECONDS = float(os.getenv("IMPORT_REPORT_TTL_SECONDS", "3600"))
+
+REQUIRED_COLUMNS = ("username", "email", "password", "role", "full_name")
+REPORT_COLUMNS = ("line", "username", "email", "error")
+PROFILE_MODELS = {"Estudante": models.Estudante, "Professor": models.Professor}
+PROFILE_FIELDS = {"Estudante": ("full_name", "vinculo", "curso"), "Professor": ("full_name", "vinculo", "departamento")}
+
+Line = Tuple[int, dict]
+
+
+def _read_batch(reader: csv.DictReader, size: int) -> List[Line]:
+    batch = []
+    for row in reader:
+        batch.append((reader.line_num, row))
+        if len(batch) >= size:
+            break
+    return batch
+
+
+async def _batches(reader: csv.DictReader, size: int, errors: list) -> AsyncIterator[List[Line]]:
+    # A leitura do arquivo (síncrona) roda fora do event loop
+    while True:
+        try:
+            batch = await run_in_threadpool(_read_batch, reader, size)
+        except (UnicodeDecodeError, csv.Error) as exc:
+            # Lotes anteriores já foram gravados: o resto do arquivo entra no relatório
+            _reject(errors, reader.line_num + 1, {}, f"Could not read the file from this line on: {exc}")
+            return
+        if not batch:
+            return
+        yield batch
+
+
+def _reject(errors: list, line: int, row: dict, error: str):
+    errors.append({"line": line, "username": row.get("username") or "", "email": row.get("email") or "", "error": error})
+
+
+def _validate(line: int, row: dict, errors: list) -> Optional[schemas.RosterRow]:
+    # Células vazias contam como ausentes: "Field required" nas obrigatórias, None nas opcionais
+    values = {key: value.strip() for key, value in row.items() if key and value and value.strip()}
+    try:
+        return schemas.RosterRow(**values)
+    except ValidationError as exc:
+        _reject(errors, line, row, "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors()))
+        return None
+
+
+async def _taken(db: AsyncSession, rows: List[schemas.RosterRow]) -> Tuple[set, set]:
+    usernames = [row.username for row in rows]
+    emails = [row.email for row in rows]
+    result = await db.execute(
+        select(models.User.username, models.User.email)
+        .where(or_(models.User.username.in_(usernames), models.User.email.in_(emails)))
+    )
+    taken = result.all()
+    return {username for username, _ in taken}, {email for _, email in taken}
+
+
+async def _write(db: AsyncSession, rows: List[schemas.RosterRow], hashes: List[str]):
+    result = await db.execute(
+        insert(models.User).returning(models.User.user_id, models.User.username),
+        [
+            {"username": row.username, "email": row.email, "password": hashed, "role": row.role}
+            for row, hashed in zip(rows, hashes)
+        ],
+    )
+    user_ids = {username: user_id for user_id, username in result.all()}
+    for role, model in PROFILE_MODELS.items():
+        profiles = [
+            {"user_id": user_ids[row.username], **{name: getattr(row, name) for name in PROFILE_FIELDS[role]}}
+            for row in rows if row.role == role
+        ]
+        if profiles:
+            await db.execute(insert(model), profiles)
+
+
+async def import_roster(db: AsyncSession, lines: Iterable[str]) -> schemas.RosterImportResult:
+    """Cria User + Estudante/Professor para cada linha válida do CSV.
+
+    O arquivo é lido em lotes de IMPORT_BATCH_SIZE linhas; cada lote tem uma
+    query de unicidade, os hashes em paralelo no pool de processos e uma
+    transação com INSERTs multi-linha. Lotes já gravados não são desfeitos
+    por erros nos seguintes.
+    """
+    reader = csv.DictReader(lines)
+    try:
+        fieldnames = await run_in_threadpool(lambda: reader.fieldnames)
+    except (UnicodeDecodeError, csv.Error):
+        raise bad_request("File must be UTF-8 encoded CSV")
+    missing = [name for name in REQUIRED_COLUMNS if name not in (fieldnames or ())]
+    if missing:
+        raise bad_request(f"Missing columns: {', '.join(missing)}")
+
+    created, errors = 0, []
+    seen_usernames, seen_emails = set(), set()
+    async for batch in _batches(reader, IMPORT_BATCH_SIZE, errors):
+        candidates = []
+        for line, row in batch:
+            parsed = _validate(line, row, errors)
+            if parsed is None:
+                continue
+            if parsed.username in seen_usernames or parsed.email in seen_emails:
+                _reject(errors, line, row, "Username or email repeated in file")
+                continue
+            seen_usernames.add(parsed.username)
+            seen_emails.add(parsed.email)
+            candidates.append((line, row, parsed))
+        if not candidates:
+            continue
+
+        taken_usernames, taken_emails = await _taken(db, [parsed for _, _, parsed in candidates])
+        accepted = []
+        for line, row, parsed in candidates:
+            if parsed.username in taken_usernames:
+                _reject(errors, line, row, "Username already registered")
+            elif parsed.email in taken_emails:
+                _reject(errors, line, row, "Email already registered")
+            else:
+                accepted.append((line, row, parsed))
+        if not accepted:
+            continue
+
+        rows = [parsed for _, _, parsed in accepted]
+        try:
+            hashes = await import_hash_pool.hash_many([row.password for row in rows])
+        except HashQueueFull:
+            # Só este lote fica de fora; os já gravados continuam contando no resultado
+            for line, row, _ in accepted:
+                _reject(errors, line, row, "Password hashing is busy; retry these lines")
+            continue
+        try:
+            await _write(db, rows, hashes)
+            await db.commit()
+        except IntegrityError:
+            # Outro cliente criou um desses usuários entre a checagem e o INSERT
+            await db.rollback()
+            for line, row, _ in accepted:
+                _reject(errors, line, row, "Batch conflicted with a concurrent change; retry these lines")
+            continue
+        created += len(rows)
+
+    report_id = await save_report(db, errors) if errors else None
+    return schemas.RosterImportResult(created=created, rejected=len(errors), report_id=report_id)
+
+
+def render_report(errors: list) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=REPORT_COLUMNS)
+    writer.writeheader()
+    writer.writerows(sorted(errors, key=lambda error: error["line"]))
+    return buffer.getvalue()
+
+
+async def save_report(db: AsyncSession, errors: list) -> str:
+    """Grava o relatório no banco, visível para qualquer worker, e descarta os expirados."""
+    now = datetime.now(timezone.utc)
+    report_id = uuid.uuid4().hex
+    await db.execute(delete(models.ImportReport).where(models.ImportReport.expires_at < now))
+    await db.execute(insert(models.ImportReport).values(
+        report_id=report_id,
+        content=render_report(errors),
+        expires_at=now + timedelta(seconds=IMPORT_REPORT_TTL_SECONDS),
+    ))
+    await db.commit()
+    return report_id
+
+
+async def read_report(db: AsyncSession, report_id: str) -> Optional[str]:
+    result = await db.execute(
+        select(models.ImportReport.content).where(
+            models.ImportReport.report_id == report_id,
+            models.ImportReport.expires_at >= datetime.now(timezone.utc),
+        )
+    )
+    return result.scalar()
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from .. import models, database
+from ..hashing import hash_pool, import_hash_pool
+from ..throttle import login_throttle
+from ..counting import count_cache
+from ..stats import stats_cache
+from ..portfolio import refresher as portfolio_refresher
+from . import auth
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def require_admin(current_user: models.User = Depends(auth.get_current_user)):
+    if current_user.role != "Admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only administrators can access this resource"
+        )
+    return current_user
+
+
+@router.get("/metrics")
+async def read_metrics(request: Request, current_user: models.User = Depends(require_admin)):
+    return {
+        "pool": database.get_pool_metrics(),
+        "read_pool": database.get_read_pool_metrics(),
+        "startup": getattr(request.app.state, "startup_timings", None),
+        "user_cache": auth.user_cache.stats(),
+        "revocation_list": auth.revocation_list.stats(),
+        "hashing": hash_pool.stats(),
+        "import_hashing": import_hash_pool.stats(),
+        "login_throttle": login_throttle.stats(),
+        "count_cache": count_cache.stats(),
+        "stats_cache": stats_cache.stats(),
+        "portfolio_views": portfolio_refresher.stats(),
+    }
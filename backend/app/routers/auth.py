@@ -1,31 +1,81 @@
 import os
+import time
+import logging
+from uuid import uuid4
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status,APIRouter
+from fastapi import BackgroundTasks, Depends, HTTPException, Request, status,APIRouter
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import update
+from sqlalchemy.exc import SQLAlchemyError
 from .. import models, schemas, database
+from ..cache import TTLCache
+from ..revocation import RevocationList
+from ..hashing import hash_pool, HashQueueFull, needs_rehash
+from ..throttle import login_throttle
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+logger = logging.getLogger("app.auth")
+
 SECRET_KEY = os.getenv("SECRET_KEY", "supersecretkey")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "1024"))
+# Tokens com user_id/role/email embutidos: get_current_user dispensa o banco
+JWT_STATELESS_CLAIMS = os.getenv("JWT_STATELESS_CLAIMS", "false").lower() in ("1", "true", "yes")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
-# Password hashing
+# Usuários autenticados, indexados pelo "sub" do token
+user_cache = TTLCache(maxsize=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
+revocation_list = RevocationList(token_lifetime_seconds=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+# Sub-requisições de POST /batch já chegam com o usuário autenticado no scope ASGI
+AUTHENTICATED_USER_SCOPE_KEY = "app.authenticated_user"
+
+def invalidate_cached_user(user_id: int):
+    user_cache.discard_where(lambda user: user.user_id == user_id)
+
+# Mudanças que invalidam tokens já emitidos: credenciais sempre; username e
+# email só quando viajam dentro do token (JWT_STATELESS_CLAIMS)
+CREDENTIAL_FIELDS = ("password", "role")
+STATELESS_CLAIM_FIELDS = ("username", "email")
+
+def revokes_tokens(changed) -> bool:
+    fields = CREDENTIAL_FIELDS + (STATELESS_CLAIM_FIELDS if JWT_STATELESS_CLAIMS else ())
+    return any(field in changed for field in fields)
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+def revoke_user_tokens(user_id: int, at: Optional[float] = None):
+    revocation_list.revoke_user(user_id, at)
+    revocation_list.prune()
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+# Password hashing: o bcrypt roda no pool de hashing, fora do event loop
+
+def _hash_pool_busy():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Serviço de autenticação sobrecarregado, tente novamente",
+        headers={"Retry-After": "1"},
+    )
+
+async def verify_password_async(plain_password, hashed_password):
+    try:
+        return await hash_pool.verify(plain_password, hashed_password)
+    except HashQueueFull:
+        raise _hash_pool_busy()
+
+async def get_password_hash_async(password):
+    try:
+        return await hash_pool.hash(password)
+    except HashQueueFull:
+        raise _hash_pool_busy()
 
 # JWT token
 
@@ -36,19 +86,67 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def token_claims(user: models.User) -> dict:
+    claims = {"sub": user.username, "iat": time.time()}
+    if JWT_STATELESS_CLAIMS:
+        claims.update({
+            "uid": user.user_id,
+            "role": user.role,
+            "email": user.email,
+            "jti": uuid4().hex,
+        })
+    return claims
+
+def user_from_claims(payload: dict) -> Optional[models.User]:
+    if not JWT_STATELESS_CLAIMS or "uid" not in payload or "role" not in payload:
+        return None
+    # Instância transitória: só colunas, nunca anexada a uma sessão
+    return models.User(
+        user_id=payload["uid"],
+        username=payload["sub"],
+        email=payload.get("email"),
+        role=payload["role"],
+    )
+
 async def get_user_by_username(db: AsyncSession, username: str):
     result = await db.execute(select(models.User).where(models.User.username == username))
     return result.scalars().first()
 
-async def authenticate_user(db: AsyncSession, username: str, password: str):
+async def rehash_password(user_id: int, password: str, old_hash: str, session_factory=None):
+    # Roda depois da resposta: uma falha só adia o rehash para o próximo login
+    try:
+        new_hash = await hash_pool.hash(password)
+        async with (session_factory or database.AsyncSessionLocal)() as session:
+            # Só troca se a senha não foi alterada entre o login e agora. updated_at
+            # avança (onupdate/trigger), mas tokens_valid_after não: a sessão segue válida
+            await session.execute(
+                update(models.User)
+                .where(models.User.user_id == user_id, models.User.password == old_hash)
+                .values(password=new_hash)
+            )
+            await session.commit()
+    except HashQueueFull:
+        logger.info("password rehash for user %s skipped: hash pool busy", user_id)
+        return
+    except SQLAlchemyError as exc:
+        logger.warning("password rehash for user %s failed: %s", user_id, exc)
+        return
+    invalidate_cached_user(user_id)
+
+async def authenticate_user(db: AsyncSession, username: str, password: str, background_tasks: Optional[BackgroundTasks] = None):
     user = await get_user_by_username(db, username)
     if not user:
         return False
-    if not verify_password(password, user.password):
+    if not await verify_password_async(password, user.password):
         return False
+    # Hash com custo desatualizado (BCRYPT_ROUNDS mudou): refaz depois da resposta
+    if background_tasks is not None and needs_rehash(user.password):
+        background_tasks.add_task(rehash_password, user.user_id, password, user.password)
     return user
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(database.get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(database.get_db), request: Request = None):
+    if request is not None and request.scope.get(AUTHENTICATED_USER_SCOPE_KEY) is not None:
+        return request.scope[AUTHENTICATED_USER_SCOPE_KEY]
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -61,17 +159,39 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = await get_user_by_username(db, username)
+    if revocation_list.is_revoked(payload):
+        raise credentials_exception
+    user = user_from_claims(payload)
+    if user is not None:
+        return user
+    user = user_cache.get(username)
     if user is None:
+        user = await get_user_by_username(db, username)
+        if user is None:
+            raise credentials_exception
+        user_cache.set(username, user)
+    if revocation_list.is_revoked({**payload, "uid": user.user_id}):
         raise credentials_exception
-    return user 
+    return user
 
 @router.post("/token", response_model=schemas.Token)
 async def login_for_access_token(
+    request: Request,
+    background_tasks: BackgroundTasks,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(database.get_db)
 ):
-    user = await authenticate_user(db, form_data.username, form_data.password)
+    # Barra tentativas em excesso antes de qualquer consulta ao banco ou bcrypt
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = await login_throttle.check(client_ip, form_data.username)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Muitas tentativas de login, tente novamente mais tarde",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    user = await authenticate_user(db, form_data.username, form_data.password, background_tasks)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -82,7 +202,7 @@ async def login_for_access_token(
     # Cria token com tempo de expiração
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username},  # "sub" é o padrão JWT para subject
+        data=token_claims(user),  # "sub" é o padrão JWT para subject
         expires_delta=access_token_expires
     )
     
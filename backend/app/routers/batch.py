@@ -0,0 +1,118 @@
+import os
+import json
+import asyncio
+from typing import List
+from urllib.parse import urlsplit
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from .. import models, schemas, database
+from . import auth
+
+# O POST do lote em si não é escrita: sem isso o cliente ficaria marcado e
+# todas as sub-requisições GET sairiam da réplica para o primário
+router = APIRouter(prefix="/batch", tags=["batch"], dependencies=[Depends(database.read_only_request)])
+
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+# Leituras simultâneas por lote; cada uma usa sua própria sessão/conexão do pool
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+READ_METHODS = {"GET", "HEAD"}
+# Cabeçalhos da requisição original que não se aplicam às sub-requisições
+_SKIPPED_HEADERS = {b"content-length", b"content-type", b"transfer-encoding"}
+
+
+def _item_error(item: schemas.BatchItem, code: int, detail: str) -> schemas.BatchItemResult:
+    return schemas.BatchItemResult(id=item.id, status=code, body={"detail": detail})
+
+
+def _sub_scope(request: Request, item: schemas.BatchItem, user, body: bytes) -> dict:
+    url = urlsplit(item.path)
+    headers = [(k, v) for k, v in request.scope["headers"] if k not in _SKIPPED_HEADERS]
+    if body:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    return {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": item.method.upper(),
+        "scheme": request.scope.get("scheme", "http"),
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "headers": headers,
+        "state": dict(request.scope.get("state") or {}),
+        auth.AUTHENTICATED_USER_SCOPE_KEY: user,
+    }
+
+
+async def _dispatch(request: Request, item: schemas.BatchItem, user) -> schemas.BatchItemResult:
+    if not item.path.startswith("/") or urlsplit(item.path).path.rstrip("/") == router.prefix:
+        return _item_error(item, status.HTTP_400_BAD_REQUEST, "Invalid sub-request path")
+    body = json.dumps(item.body).encode() if item.body is not None else b""
+    scope = _sub_scope(request, item, user, body)
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    result = {"status": 500, "headers": [], "body": b""}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+            result["headers"] = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            result["body"] += message.get("body", b"")
+
+    try:
+        await request.app(scope, receive, send)
+    except Exception:
+        # O ServerErrorMiddleware já respondeu 500; o erro não derruba o lote inteiro
+        result["status"] = status.HTTP_500_INTERNAL_SERVER_ERROR
+
+    headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in result["headers"]}
+    content_type = headers.pop("content-type", "")
+    headers.pop("content-length", None)
+    payload = result["body"].decode() if result["body"] else None
+    if payload and content_type.startswith("application/json"):
+        payload = json.loads(payload)
+    return schemas.BatchItemResult(id=item.id, status=result["status"], headers=headers, body=payload)
+
+
+@router.post("/", response_model=List[schemas.BatchItemResult])
+async def run_batch(
+    request: Request,
+    batch: schemas.BatchRequest,
+    current_user: models.User = Depends(auth.get_current_user)
+):
+    if len(batch.requests) > BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {BATCH_MAX_REQUESTS} requests per batch",
+        )
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run_read(item):
+        async with semaphore:
+            return await _dispatch(request, item, current_user)
+
+    # Leituras consecutivas rodam em paralelo; uma escrita espera as anteriores
+    # e bloqueia as seguintes, preservando a ordem em que o cliente as enviou.
+    results, reads = [], []
+    for item in batch.requests:
+        if item.method.upper() in READ_METHODS:
+            reads.append(item)
+            continue
+        if reads:
+            results += await asyncio.gather(*(run_read(read) for read in reads))
+            reads = []
+        results.append(await _dispatch(request, item, current_user))
+    if reads:
+        results += await asyncio.gather(*(run_read(read) for read in reads))
+    return results
@@ -1,61 +1,72 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
-from typing import List
+from typing import List, Optional
 from .. import models, schemas, database
 from . import auth
+from ..pagination import PageParams, page_params, ids_param, fetch_page, primary_key_order
+from ..projection import FieldSet, Projection
+from ..repository import Reference, Repository
 
 router = APIRouter(prefix="/disciplinas", tags=["disciplinas"])
 
+disciplina_repository = Repository(
+    models.Disciplina,
+    not_found="Disciplina not found",
+    references=[Reference("professor_id", models.Professor.professor_id, "Professor not found")],
+)
+
+disciplina_fields = FieldSet(
+    models.Disciplina,
+    schemas.DisciplinaRead,
+    expandable={
+        "professor": schemas.ProfessorRead,
+        "projetos": schemas.ProjetoRead,
+    },
+)
+
 @router.post("/", response_model=schemas.DisciplinaRead)
 async def create_disciplina(
     disciplina: schemas.DisciplinaCreate,
     db: AsyncSession = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    if disciplina.professor_id:
-        result = await db.execute(select(models.Professor).where(models.Professor.professor_id == disciplina.professor_id))
-        if not result.scalars().first():
-            raise HTTPException(status_code=404, detail="Professor not found")
-    
-    db_disciplina = models.Disciplina(**disciplina.dict())
-    db.add(db_disciplina)
-    await db.commit()
-    await db.refresh(db_disciplina)
-    return db_disciplina
+    return await disciplina_repository.create(db, disciplina)
 
 @router.get("/", response_model=List[schemas.DisciplinaRead])
 async def read_disciplinas(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Projection = Depends(disciplina_fields),
+    ids: Optional[List[int]] = Depends(ids_param),
     db: AsyncSession = Depends(database.get_db)
 ):
-    result = await db.execute(
-        select(models.Disciplina)
-        .options(selectinload(models.Disciplina.professor))
-        .offset(skip)
-        .limit(limit)
+    order = primary_key_order(models.Disciplina)
+    return await fetch_page(
+        db,
+        select(models.Disciplina),
+        page,
+        order,
+        response,
+        fields,
+        ids
     )
-    return result.scalars().all()
 
 @router.get("/{disciplina_id}", response_model=schemas.DisciplinaRead)
 async def read_disciplina(
     disciplina_id: int,
+    fields: Projection = Depends(disciplina_fields),
     db: AsyncSession = Depends(database.get_db)
 ):
     result = await db.execute(
         select(models.Disciplina)
-        .options(
-            selectinload(models.Disciplina.professor),
-            selectinload(models.Disciplina.projetos)
-        )
+        .options(*fields.options())
         .where(models.Disciplina.disciplina_id == disciplina_id)
     )
     disciplina = result.scalars().first()
     if disciplina is None:
         raise HTTPException(status_code=404, detail="Disciplina not found")
-    return disciplina
+    return fields.render(disciplina)
 
 @router.put("/{disciplina_id}", response_model=schemas.DisciplinaRead)
 async def update_disciplina(
@@ -64,23 +75,7 @@ async def update_disciplina(
     db: AsyncSession = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    result = await db.execute(select(models.Disciplina).where(models.Disciplina.disciplina_id == disciplina_id))
-    db_disciplina = result.scalars().first()
-    if db_disciplina is None:
-        raise HTTPException(status_code=404, detail="Disciplina not found")
-    
-    update_data = disciplina_update.dict(exclude_unset=True)
-    if 'professor_id' in update_data and update_data['professor_id']:
-        result = await db.execute(select(models.Professor).where(models.Professor.professor_id == update_data['professor_id']))
-        if not result.scalars().first():
-            raise HTTPException(status_code=404, detail="Professor not found")
-    
-    for field, value in update_data.items():
-        setattr(db_disciplina, field, value)
-    
-    await db.commit()
-    await db.refresh(db_disciplina)
-    return db_disciplina
+    return await disciplina_repository.update(db, disciplina_id, disciplina_update.model_dump(exclude_unset=True))
 
 @router.delete("/{disciplina_id}")
 async def delete_disciplina(
@@ -88,34 +83,43 @@ async def delete_disciplina(
     db: AsyncSession = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    result = await db.execute(select(models.Disciplina).where(models.Disciplina.disciplina_id == disciplina_id))
-    db_disciplina = result.scalars().first()
-    if db_disciplina is None:
-        raise HTTPException(status_code=404, detail="Disciplina not found")
-    
-    await db.delete(db_disciplina)
-    await db.commit()
+    await disciplina_repository.delete(db, disciplina_id)
     return {"message": "Disciplina deleted successfully"}
 
 @router.get("/professor/{professor_id}", response_model=List[schemas.DisciplinaRead])
 async def read_disciplinas_by_professor(
     professor_id: int,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Projection = Depends(disciplina_fields),
     db: AsyncSession = Depends(database.get_db)
 ):
-    result = await db.execute(
+    order = primary_key_order(models.Disciplina)
+    return await fetch_page(
+        db,
         select(models.Disciplina)
-        .where(models.Disciplina.professor_id == professor_id)
+        .where(models.Disciplina.professor_id == professor_id),
+        page,
+        order,
+        response,
+        fields
     )
-    return result.scalars().all()
 
 @router.get("/search/{nome}", response_model=List[schemas.DisciplinaRead])
 async def search_disciplinas_by_name(
     nome: str,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Projection = Depends(disciplina_fields),
     db: AsyncSession = Depends(database.get_db)
 ):
-    result = await db.execute(
+    order = primary_key_order(models.Disciplina)
+    return await fetch_page(
+        db,
         select(models.Disciplina)
-        .options(selectinload(models.Disciplina.professor))
-        .where(models.Disciplina.nome_disciplina.ilike(f"%{nome}%"))
+        .where(models.Disciplina.nome_disciplina.ilike(f"%{nome}%")),
+        page,
+        order,
+        response,
+        fields
     )
-    return result.scalars().all()
@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from app import models, schemas
-from app.database import get_db
+from typing import List, Optional
+from app import models, schemas, reports
+from app.database import get_db, session_factory
+from app.pagination import PageParams, page_params, ids_param, fetch_page
+from app.projection import FieldSet, Projection
+from app.repository import Repository
+from app.export import export_format, export_response
+from app.filtering import FilterSet, ListQuery
 from . import auth
 
 router = APIRouter(
@@ -10,31 +16,74 @@ router = APIRouter(
     tags=["estudantes"],
 )
 
+estudante_filters = FilterSet(
+    models.Estudante,
+    filters={
+        "curso": models.Estudante.curso,
+        "vinculo": models.Estudante.vinculo,
+        "full_name": models.Estudante.full_name,
+        "user_id": models.Estudante.user_id,
+    },
+    sortable=["student_id", "full_name", "curso", "vinculo", "created_at"],
+    default_ops={"full_name": "contains"},
+)
+
+estudante_repository = Repository(models.Estudante, not_found="Estudante not found")
+
+estudante_fields = FieldSet(
+    models.Estudante,
+    schemas.EstudanteRead,
+    expandable={
+        "matriculas": schemas.MatriculaProjetosRead,
+        "task_estudantes": schemas.TaskEstudanteRead,
+    },
+)
+
 @router.post("/", response_model=schemas.EstudanteRead, status_code=status.HTTP_201_CREATED)
 async def create_estudante(
     estudante: schemas.EstudanteCreate, 
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    db_estudante = models.Estudante(**estudante.model_dump())
-    db.add(db_estudante)
-    await db.commit()
-    await db.refresh(db_estudante)
-    return db_estudante
+    return await estudante_repository.create(db, estudante)
 
 @router.get("/", response_model=list[schemas.EstudanteRead])
-async def read_estudantes(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.Estudante).offset(skip).limit(limit))
-    estudantes = result.scalars().all()
-    return estudantes
+async def read_estudantes(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    query: ListQuery = Depends(estudante_filters),
+    fields: Projection = Depends(estudante_fields),
+    ids: Optional[List[int]] = Depends(ids_param),
+    db: AsyncSession = Depends(get_db)
+):
+    return await fetch_page(db, select(models.Estudante).where(*query.conditions), page, query.order, response, fields, ids)
+
+@router.get("/export")
+async def export_estudantes(
+    format: str = Depends(export_format),
+    query: ListQuery = Depends(estudante_filters),
+    sessions=Depends(session_factory)
+):
+    return export_response(sessions, models.Estudante, schemas.EstudanteRead, format, query.conditions, query.order)
 
 @router.get("/{estudante_id}", response_model=schemas.EstudanteRead)
-async def read_estudante(estudante_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.Estudante).filter(models.Estudante.student_id == estudante_id))
+async def read_estudante(estudante_id: int, fields: Projection = Depends(estudante_fields), db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(models.Estudante).options(*fields.options()).filter(models.Estudante.student_id == estudante_id))
     db_estudante = result.scalars().first()
     if db_estudante is None:
         raise HTTPException(status_code=404, detail="Estudante not found")
-    return db_estudante
+    return fields.render(db_estudante)
+
+@router.get("/{estudante_id}/overview", response_model=schemas.EstudanteOverview)
+async def read_estudante_overview(
+    estudante_id: int,
+    days: int = Query(14, ge=0, le=365, description="Janela dos próximos prazos, em dias"),
+    db: AsyncSession = Depends(get_db)
+):
+    overview = await reports.student_overview(db, estudante_id, days)
+    if overview is None:
+        raise HTTPException(status_code=404, detail="Estudante not found")
+    return overview
 
 @router.put("/{estudante_id}", response_model=schemas.EstudanteRead)
 async def update_estudante(
@@ -43,16 +92,7 @@ async def update_estudante(
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    result = await db.execute(select(models.Estudante).filter(models.Estudante.student_id == estudante_id))
-    db_estudante = result.scalars().first()
-    if db_estudante is None:
-        raise HTTPException(status_code=404, detail="Estudante not found")
-    update_data = estudante.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_estudante, key, value)
-    await db.commit()
-    await db.refresh(db_estudante)
-    return db_estudante
+    return await estudante_repository.update(db, estudante_id, estudante.model_dump(exclude_unset=True))
 
 @router.delete("/{estudante_id}")
 async def delete_estudante(
@@ -60,11 +100,5 @@ async def delete_estudante(
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    result = await db.execute(select(models.Estudante).filter(models.Estudante.student_id == estudante_id))
-    db_estudante = result.scalars().first()
-    if db_estudante is None:
-        raise HTTPException(status_code=404, detail="Estudante not found")
-    
-    await db.delete(db_estudante)
-    await db.commit()
-    return {"message": "Estudante deleted successfully"}
\ No newline at end of file
+    await estudante_repository.delete(db, estudante_id)
+    return {"message": "Estudante deleted successfully"}
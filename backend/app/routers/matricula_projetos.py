@@ -1,75 +1,103 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
-from sqlalchemy.exc import IntegrityError
-from typing import List
-from .. import models, schemas, database
+from typing import List, Optional
+from .. import models, schemas, database, bulk
 from . import auth
+from ..pagination import PageParams, page_params, ids_param, fetch_page, primary_key_order
+from ..projection import FieldSet, Projection
+from ..repository import Reference, Repository
+from ..export import export_format, export_response
 
 router = APIRouter(prefix="/matriculas", tags=["matriculas"])
 
+matricula_references = [
+    Reference("student_id", models.Estudante.student_id, "Student not found"),
+    Reference("projeto_id", models.Projeto.projeto_id, "Project not found"),
+]
+
+matricula_repository = Repository(
+    models.MatriculaProjetos,
+    not_found="Matricula not found",
+    references=matricula_references,
+    conflict_detail="Student is already enrolled in this project",
+)
+
+matricula_fields = FieldSet(
+    models.MatriculaProjetos,
+    schemas.MatriculaProjetosRead,
+    expandable={
+        "estudante": schemas.EstudanteRead,
+        "projeto": schemas.ProjetoRead,
+    },
+)
+
 @router.post("/", response_model=schemas.MatriculaProjetosRead)
 async def create_matricula(
     matricula: schemas.MatriculaProjetosCreate,
     db: AsyncSession = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    result = await db.execute(select(models.Estudante).where(models.Estudante.student_id == matricula.student_id))
-    if not result.scalars().first():
-        raise HTTPException(status_code=404, detail="Student not found")
-    
-    result = await db.execute(select(models.Projeto).where(models.Projeto.projeto_id == matricula.projeto_id))
-    if not result.scalars().first():
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    try:
-        db_matricula = models.MatriculaProjetos(**matricula.dict())
-        db.add(db_matricula)
-        await db.commit()
-        await db.refresh(db_matricula)
-        return db_matricula
-    except IntegrityError:
-        await db.rollback()
-        raise HTTPException(
-            status_code=400, 
-            detail="Student is already enrolled in this project"
-        )
+    return await matricula_repository.create(db, matricula)
+
+@router.post("/bulk", response_model=List[schemas.BulkItemResult])
+async def create_matriculas_bulk(
+    matriculas: List[schemas.MatriculaProjetosCreate],
+    db: AsyncSession = Depends(database.get_db),
+    current_user: models.User = Depends(auth.get_current_user)
+):
+    bulk.check_size(matriculas)
+    return await bulk.bulk_create(
+        db,
+        models.MatriculaProjetos,
+        schemas.MatriculaProjetosRead,
+        matriculas,
+        references=matricula_references,
+        unique=("student_id", "projeto_id"),
+        duplicate_detail=matricula_repository.conflict_detail,
+    )
 
 @router.get("/", response_model=List[schemas.MatriculaProjetosRead])
 async def read_matriculas(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Projection = Depends(matricula_fields),
+    ids: Optional[List[int]] = Depends(ids_param),
     db: AsyncSession = Depends(database.get_db)
 ):
-    result = await db.execute(
-        select(models.MatriculaProjetos)
-        .options(
-            selectinload(models.MatriculaProjetos.estudante),
-            selectinload(models.MatriculaProjetos.projeto)
-        )
-        .offset(skip)
-        .limit(limit)
+    order = primary_key_order(models.MatriculaProjetos)
+    return await fetch_page(
+        db,
+        select(models.MatriculaProjetos),
+        page,
+        order,
+        response,
+        fields,
+        ids
     )
-    return result.scalars().all()
+
+@router.get("/export")
+async def export_matriculas(
+    format: str = Depends(export_format),
+    sessions=Depends(database.session_factory)
+):
+    return export_response(sessions, models.MatriculaProjetos, schemas.MatriculaProjetosRead, format)
 
 @router.get("/{matricula_id}", response_model=schemas.MatriculaProjetosRead)
 async def read_matricula(
     matricula_id: int,
+    fields: Projection = Depends(matricula_fields),
     db: AsyncSession = Depends(database.get_db)
 ):
     result = await db.execute(
         select(models.MatriculaProjetos)
-        .options(
-            selectinload(models.MatriculaProjetos.estudante),
-            selectinload(models.MatriculaProjetos.projeto)
-        )
+        .options(*fields.options())
         .where(models.MatriculaProjetos.matricula_id == matricula_id)
     )
     matricula = result.scalars().first()
     if matricula is None:
         raise HTTPException(status_code=404, detail="Matricula not found")
-    return matricula
+    return fields.render(matricula)
 
 @router.put("/{matricula_id}", response_model=schemas.MatriculaProjetosRead)
 async def update_matricula(
@@ -78,18 +106,7 @@ async def update_matricula(
     db: AsyncSession = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    result = await db.execute(select(models.MatriculaProjetos).where(models.MatriculaProjetos.matricula_id == matricula_id))
-    db_matricula = result.scalars().first()
-    if db_matricula is None:
-        raise HTTPException(status_code=404, detail="Matricula not found")
-    
-    update_data = matricula_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_matricula, field, value)
-    
-    await db.commit()
-    await db.refresh(db_matricula)
-    return db_matricula
+    return await matricula_repository.update(db, matricula_id, matricula_update.model_dump(exclude_unset=True))
 
 @router.delete("/{matricula_id}")
 async def delete_matricula(
@@ -97,35 +114,43 @@ async def delete_matricula(
     db: AsyncSession = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    result = await db.execute(select(models.MatriculaProjetos).where(models.MatriculaProjetos.matricula_id == matricula_id))
-    db_matricula = result.scalars().first()
-    if db_matricula is None:
-        raise HTTPException(status_code=404, detail="Matricula not found")
-    
-    await db.delete(db_matricula)
-    await db.commit()
+    await matricula_repository.delete(db, matricula_id)
     return {"message": "Matricula deleted successfully"}
 
 @router.get("/student/{student_id}", response_model=List[schemas.MatriculaProjetosRead])
 async def read_matriculas_by_student(
     student_id: int,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Projection = Depends(matricula_fields),
     db: AsyncSession = Depends(database.get_db)
 ):
-    result = await db.execute(
+    order = primary_key_order(models.MatriculaProjetos)
+    return await fetch_page(
+        db,
         select(models.MatriculaProjetos)
-        .options(selectinload(models.MatriculaProjetos.projeto))
-        .where(models.MatriculaProjetos.student_id == student_id)
+        .where(models.MatriculaProjetos.student_id == student_id),
+        page,
+        order,
+        response,
+        fields
     )
-    return result.scalars().all()
 
 @router.get("/project/{projeto_id}", response_model=List[schemas.MatriculaProjetosRead])
 async def read_matriculas_by_project(
     projeto_id: int,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Projection = Depends(matricula_fields),
     db: AsyncSession = Depends(database.get_db)
 ):
-    result = await db.execute(
+    order = primary_key_order(models.MatriculaProjetos)
+    return await fetch_page(
+        db,
         select(models.MatriculaProjetos)
-        .options(selectinload(models.MatriculaProjetos.estudante))
-        .where(models.MatriculaProjetos.projeto_id == projeto_id)
-    )
-    return result.scalars().all()
\ No newline at end of file
+        .where(models.MatriculaProjetos.projeto_id == projeto_id),
+        page,
+        order,
+        response,
+        fields
+    )
\ No newline at end of file
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from app import models, schemas
+from typing import List, Optional
+from app import models, schemas, portfolio
 from app.database import get_db
+from app.pagination import PageParams, page_params, ids_param, fetch_page, primary_key_order
+from app.projection import FieldSet, Projection
+from app.repository import Repository
 from . import auth
 
 router = APIRouter(
@@ -10,31 +14,37 @@ router = APIRouter(
     tags=["ongs"],
 )
 
+ong_repository = Repository(models.ONG, not_found="ONG not found")
+
+ong_fields = FieldSet(models.ONG, schemas.ONGRead, expandable={"projetos": schemas.ProjetoRead})
+
 @router.post("/", response_model=schemas.ONGRead, status_code=status.HTTP_201_CREATED)
 async def create_ong(
     ong: schemas.ONGCreate, 
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    db_ong = models.ONG(**ong.model_dump())
-    db.add(db_ong)
-    await db.commit()
-    await db.refresh(db_ong)
-    return db_ong
+    return await ong_repository.create(db, ong)
 
 @router.get("/", response_model=list[schemas.ONGRead])
-async def read_ongs(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.ONG).offset(skip).limit(limit))
-    ongs = result.scalars().all()
-    return ongs
+async def read_ongs(response: Response, page: PageParams = Depends(page_params), fields: Projection = Depends(ong_fields), ids: Optional[List[int]] = Depends(ids_param), db: AsyncSession = Depends(get_db)):
+    order = primary_key_order(models.ONG)
+    return await fetch_page(db, select(models.ONG), page, order, response, fields, ids)
 
 @router.get("/{ong_id}", response_model=schemas.ONGRead)
-async def read_ong(ong_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.ONG).filter(models.ONG.ngo_id == ong_id))
+async def read_ong(ong_id: int, fields: Projection = Depends(ong_fields), db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(models.ONG).options(*fields.options()).filter(models.ONG.ngo_id == ong_id))
     db_ong = result.scalars().first()
     if db_ong is None:
         raise HTTPException(status_code=404, detail="ONG not found")
-    return db_ong
+    return fields.render(db_ong)
+
+@router.get("/{ong_id}/portfolio", response_model=schemas.Portfolio)
+async def read_ong_portfolio(ong_id: int, db: AsyncSession = Depends(get_db)):
+    result = await portfolio.read_portfolio(db, "ong", ong_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="ONG not found")
+    return result
 
 @router.put("/{ong_id}", response_model=schemas.ONGRead)
 async def update_ong(
@@ -43,16 +53,7 @@ async def update_ong(
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    result = await db.execute(select(models.ONG).filter(models.ONG.ngo_id == ong_id))
-    db_ong = result.scalars().first()
-    if db_ong is None:
-        raise HTTPException(status_code=404, detail="ONG not found")
-    update_data = ong.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_ong, key, value)
-    await db.commit()
-    await db.refresh(db_ong)
-    return db_ong
+    return await ong_repository.update(db, ong_id, ong.model_dump(exclude_unset=True))
 
 @router.delete("/{ong_id}")
 async def delete_ong(
@@ -60,11 +61,5 @@ async def delete_ong(
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    result = await db.execute(select(models.ONG).filter(models.ONG.ngo_id == ong_id))
-    db_ong = result.scalars().first()
-    if db_ong is None:
-        raise HTTPException(status_code=404, detail="ONG not found")
-    
-    await db.delete(db_ong)
-    await db.commit()
-    return {"message": "ONG deleted successfully"}
\ No newline at end of file
+    await ong_repository.delete(db, ong_id)
+    return {"message": "ONG deleted successfully"}
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from app import models, schemas
+from typing import List, Optional
+from app import models, schemas, portfolio
 from app.database import get_db
+from app.pagination import PageParams, page_params, ids_param, fetch_page, primary_key_order
+from app.projection import FieldSet, Projection
+from app.repository import Repository
 from . import auth
 
 router = APIRouter(
@@ -10,31 +14,37 @@ router = APIRouter(
     tags=["professores"],
 )
 
+professor_repository = Repository(models.Professor, not_found="Professor not found")
+
+professor_fields = FieldSet(models.Professor, schemas.ProfessorRead, expandable={"disciplinas": schemas.DisciplinaRead})
+
 @router.post("/", response_model=schemas.ProfessorRead, status_code=status.HTTP_201_CREATED)
 async def create_professor(
     professor: schemas.ProfessorCreate, 
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    db_professor = models.Professor(**professor.model_dump())
-    db.add(db_professor)
-    await db.commit()
-    await db.refresh(db_professor)
-    return db_professor
+    return await professor_repository.create(db, professor)
 
 @router.get("/", response_model=list[schemas.ProfessorRead])
-async def read_professores(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.Professor).offset(skip).limit(limit))
-    professores = result.scalars().all()
-    return professores
+async def read_professores(response: Response, page: PageParams = Depends(page_params), fields: Projection = Depends(professor_fields), ids: Optional[List[int]] = Depends(ids_param), db: AsyncSession = Depends(get_db)):
+    order = primary_key_order(models.Professor)
+    return await fetch_page(db, select(models.Professor), page, order, response, fields, ids)
 
 @router.get("/{professor_id}", response_model=schemas.ProfessorRead)
-async def read_professor(professor_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.Professor).filter(models.Professor.professor_id == professor_id))
+async def read_professor(professor_id: int, fields: Projection = Depends(professor_fields), db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(models.Professor).options(*fields.options()).filter(models.Professor.professor_id == professor_id))
     db_professor = result.scalars().first()
     if db_professor is None:
         raise HTTPException(status_code=404, detail="Professor not found")
-    return db_professor
+    return fields.render(db_professor)
+
+@router.get("/{professor_id}/portfolio", response_model=schemas.Portfolio)
+async def read_professor_portfolio(professor_id: int, db: AsyncSession = Depends(get_db)):
+    result = await portfolio.read_portfolio(db, "professor", professor_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Professor not found")
+    return result
 
 @router.put("/{professor_id}", response_model=schemas.ProfessorRead)
 async def update_professor(
@@ -43,16 +53,7 @@ async def update_professor(
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    result = await db.execute(select(models.Professor).filter(models.Professor.professor_id == professor_id))
-    db_professor = result.scalars().first()
-    if db_professor is None:
-        raise HTTPException(status_code=404, detail="Professor not found")
-    update_data = professor.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_professor, key, value)
-    await db.commit()
-    await db.refresh(db_professor)
-    return db_professor
+    return await professor_repository.update(db, professor_id, professor.model_dump(exclude_unset=True))
 
 @router.delete("/{professor_id}")
 async def delete_professor(
@@ -60,17 +61,5 @@ async def delete_professor(
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    result = await db.execute(select(models.Professor).filter(models.Professor.professor_id == professor_id))
-    db_professor = result.scalars().first()
-    if db_professor is None:
-        raise HTTPException(status_code=404, detail="Professor not found")
-    
-    await db.delete(db_professor)
-    await db.commit()
+    await professor_repository.delete(db, professor_id)
     return {"message": "Professor deleted successfully"}
-    
-    professor_data = schemas.ProfessorRead.model_validate(db_professor)
-    
-    await db.delete(db_professor)
-    await db.commit()
-    return professor_data
\ No newline at end of file
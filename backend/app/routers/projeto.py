@@ -1,64 +1,106 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
-from typing import List
-from .. import models, schemas, database
+from typing import List, Optional
+from .. import models, schemas, database, reports
 from . import auth
+from ..pagination import PageParams, page_params, ids_param, fetch_page, primary_key_order
+from ..projection import FieldSet, Projection
+from ..repository import Repository
+from ..export import export_format, export_response
+from ..filtering import FilterSet, ListQuery
 
 router = APIRouter(prefix="/projetos", tags=["projetos"])
 
+projeto_repository = Repository(models.Projeto, not_found="Projeto not found")
+
+projeto_filters = FilterSet(
+    models.Projeto,
+    filters={
+        "status": models.Projeto.status,
+        "disciplina_id": models.Projeto.disciplina_id,
+        "ngo_id": models.Projeto.ngo_id,
+        "name": models.Projeto.name,
+        "start_date": models.Projeto.start_date,
+        "end_date": models.Projeto.end_date,
+    },
+    sortable=["projeto_id", "name", "status", "start_date", "end_date", "created_at"],
+    default_ops={"name": "contains"},
+)
+
+projeto_fields = FieldSet(
+    models.Projeto,
+    schemas.ProjetoRead,
+    expandable={
+        "ong": schemas.ONGRead,
+        "disciplina": schemas.DisciplinaRead,
+        "tasks": schemas.TaskRead,
+        "matriculas": schemas.MatriculaProjetosRead,
+    },
+)
+
 @router.post("/", response_model=schemas.ProjetoRead)
 async def create_projeto(
     projeto: schemas.ProjetoCreate,
     db: AsyncSession = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-   
-    db_projeto = models.Projeto(**projeto.dict())
-    db.add(db_projeto)
-    await db.commit()
-    await db.refresh(db_projeto)
-    return db_projeto
+    return await projeto_repository.create(db, projeto)
 
 @router.get("/", response_model=List[schemas.ProjetoRead])
 async def read_projetos(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    query: ListQuery = Depends(projeto_filters),
+    fields: Projection = Depends(projeto_fields),
+    ids: Optional[List[int]] = Depends(ids_param),
     db: AsyncSession = Depends(database.get_db)
 ):
-    
-    result = await db.execute(
+    return await fetch_page(
+        db,
         select(models.Projeto)
-        .options(
-            selectinload(models.Projeto.disciplina),
-            selectinload(models.Projeto.ong)
-        )
-        .offset(skip)
-        .limit(limit)
+        .where(*query.conditions),
+        page,
+        query.order,
+        response,
+        fields,
+        ids
     )
-    return result.scalars().all()
+
+@router.get("/export")
+async def export_projetos(
+    format: str = Depends(export_format),
+    query: ListQuery = Depends(projeto_filters),
+    sessions=Depends(database.session_factory)
+):
+    return export_response(sessions, models.Projeto, schemas.ProjetoRead, format, query.conditions, query.order)
 
 @router.get("/{projeto_id}", response_model=schemas.ProjetoRead)
 async def read_projeto(
     projeto_id: int,
+    fields: Projection = Depends(projeto_fields),
     db: AsyncSession = Depends(database.get_db)
 ):
     
     result = await db.execute(
         select(models.Projeto)
-        .options(
-            selectinload(models.Projeto.disciplina),
-            selectinload(models.Projeto.ong),
-            selectinload(models.Projeto.tasks),
-            selectinload(models.Projeto.matriculas)
-        )
+        .options(*fields.options())
         .where(models.Projeto.projeto_id == projeto_id)
     )
     projeto = result.scalars().first()
     if projeto is None:
         raise HTTPException(status_code=404, detail="Projeto not found")
-    return projeto
+    return fields.render(projeto)
+
+@router.get("/{projeto_id}/dashboard", response_model=schemas.ProjetoDashboard)
+async def read_projeto_dashboard(
+    projeto_id: int,
+    db: AsyncSession = Depends(database.get_db)
+):
+    dashboard = await reports.project_dashboard(db, projeto_id)
+    if dashboard is None:
+        raise HTTPException(status_code=404, detail="Projeto not found")
+    return dashboard
 
 @router.put("/{projeto_id}", response_model=schemas.ProjetoRead)
 async def update_projeto(
@@ -67,18 +109,7 @@ async def update_projeto(
     db: AsyncSession = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    result = await db.execute(select(models.Projeto).where(models.Projeto.projeto_id == projeto_id))
-    db_projeto = result.scalars().first()
-    if db_projeto is None:
-        raise HTTPException(status_code=404, detail="Projeto not found")
-    
-    update_data = projeto_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_projeto, field, value)
-    
-    await db.commit()
-    await db.refresh(db_projeto)
-    return db_projeto
+    return await projeto_repository.update(db, projeto_id, projeto_update.model_dump(exclude_unset=True))
 
 @router.delete("/{projeto_id}")
 async def delete_projeto(
@@ -86,36 +117,43 @@ async def delete_projeto(
     db: AsyncSession = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    
-    result = await db.execute(select(models.Projeto).where(models.Projeto.projeto_id == projeto_id))
-    db_projeto = result.scalars().first()
-    if db_projeto is None:
-        raise HTTPException(status_code=404, detail="Projeto not found")
-    
-    await db.delete(db_projeto)
-    await db.commit()
+    await projeto_repository.delete(db, projeto_id)
     return {"message": "Projeto deleted successfully"}
 
 @router.get("/disciplina/{disciplina_id}", response_model=List[schemas.ProjetoRead])
 async def read_projetos_by_disciplina(
     disciplina_id: int,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Projection = Depends(projeto_fields),
     db: AsyncSession = Depends(database.get_db)
 ):
-
-    result = await db.execute(
+    order = primary_key_order(models.Projeto)
+    return await fetch_page(
+        db,
         select(models.Projeto)
-        .where(models.Projeto.disciplina_id == disciplina_id)
+        .where(models.Projeto.disciplina_id == disciplina_id),
+        page,
+        order,
+        response,
+        fields
     )
-    return result.scalars().all()
 
 @router.get("/ong/{ngo_id}", response_model=List[schemas.ProjetoRead])
 async def read_projetos_by_ong(
     ngo_id: int,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Projection = Depends(projeto_fields),
     db: AsyncSession = Depends(database.get_db)
 ):
-   
-    result = await db.execute(
+    order = primary_key_order(models.Projeto)
+    return await fetch_page(
+        db,
         select(models.Projeto)
-        .where(models.Projeto.ngo_id == ngo_id)
-    )
-    return result.scalars().all()
\ No newline at end of file
+        .where(models.Projeto.ngo_id == ngo_id),
+        page,
+        order,
+        response,
+        fields
+    )
\ No newline at end of file
@@ -0,0 +1,29 @@
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import schemas, database, stats
+from ..errors import bad_request
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("/", response_model=schemas.Stats, response_model_exclude_none=True)
+async def read_stats(
+    entity: Optional[List[str]] = Query(None),
+    group_by: Optional[List[str]] = Query(None),
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    db: AsyncSession = Depends(database.get_db)
+):
+    entities = list(dict.fromkeys(entity or stats.ENTITIES))
+    dimensions = list(dict.fromkeys(group_by or ()))
+    unknown = [name for name in entities if name not in stats.ENTITIES]
+    if unknown:
+        raise bad_request(f"Unknown entity: {', '.join(unknown)}")
+    unknown = [name for name in dimensions if name not in stats.DIMENSIONS]
+    if unknown:
+        raise bad_request(f"Cannot group by: {', '.join(unknown)}")
+    if since and until and since > until:
+        raise bad_request("since must not be after until")
+    return await stats.read_stats(db, entities, dimensions, since, until)
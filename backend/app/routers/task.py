@@ -1,60 +1,80 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, Path
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
-from typing import List
+from typing import List, Optional
 from .. import models, schemas, database
 from . import auth
+from ..pagination import PageParams, page_params, ids_param, fetch_page, primary_key_order
+from ..projection import FieldSet, Projection
+from ..repository import Reference, Repository
+from ..export import export_format, export_response
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+task_repository = Repository(
+    models.Task,
+    not_found="Task not found",
+    references=[Reference("projeto_id", models.Projeto.projeto_id, "Project not found")],
+)
+
+task_fields = FieldSet(
+    models.Task,
+    schemas.TaskRead,
+    expandable={
+        "projeto": schemas.ProjetoRead,
+        "task_estudantes": schemas.TaskEstudanteRead,
+    },
+)
+
 @router.post("/", response_model=schemas.TaskRead)
 async def create_task(
     task: schemas.TaskCreate,
     db: AsyncSession = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    result = await db.execute(select(models.Projeto).where(models.Projeto.projeto_id == task.projeto_id))
-    if not result.scalars().first():
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    db_task = models.Task(**task.dict())
-    db.add(db_task)
-    await db.commit()
-    await db.refresh(db_task)
-    return db_task
+    return await task_repository.create(db, task)
 
 @router.get("/", response_model=List[schemas.TaskRead])
 async def read_tasks(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Projection = Depends(task_fields),
+    ids: Optional[List[int]] = Depends(ids_param),
     db: AsyncSession = Depends(database.get_db)
 ):
-    result = await db.execute(
-        select(models.Task)
-        .options(selectinload(models.Task.projeto))
-        .offset(skip)
-        .limit(limit)
+    order = primary_key_order(models.Task)
+    return await fetch_page(
+        db,
+        select(models.Task),
+        page,
+        order,
+        response,
+        fields,
+        ids
     )
-    return result.scalars().all()
+
+@router.get("/export")
+async def export_tasks(
+    format: str = Depends(export_format),
+    sessions=Depends(database.session_factory)
+):
+    return export_response(sessions, models.Task, schemas.TaskRead, format)
 
 @router.get("/{task_id}", response_model=schemas.TaskRead)
 async def read_task(
     task_id: int,
+    fields: Projection = Depends(task_fields),
     db: AsyncSession = Depends(database.get_db)
 ):
     result = await db.execute(
         select(models.Task)
-        .options(
-            selectinload(models.Task.projeto),
-            selectinload(models.Task.task_estudantes)
-        )
+        .options(*fields.options())
         .where(models.Task.task_id == task_id)
     )
     task = result.scalars().first()
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task
+    return fields.render(task)
 
 @router.put("/{task_id}", response_model=schemas.TaskRead)
 async def update_task(
@@ -63,18 +83,7 @@ async def update_task(
     db: AsyncSession = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    result = await db.execute(select(models.Task).where(models.Task.task_id == task_id))
-    db_task = result.scalars().first()
-    if db_task is None:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
-    update_data = task_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_task, field, value)
-    
-    await db.commit()
-    await db.refresh(db_task)
-    return db_task
+    return await task_repository.update(db, task_id, task_update.model_dump(exclude_unset=True))
 
 @router.delete("/{task_id}")
 async def delete_task(
@@ -82,33 +91,43 @@ async def delete_task(
     db: AsyncSession = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    result = await db.execute(select(models.Task).where(models.Task.task_id == task_id))
-    db_task = result.scalars().first()
-    if db_task is None:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
-    await db.delete(db_task)
-    await db.commit()
+    await task_repository.delete(db, task_id)
     return {"message": "Task deleted successfully"}
 
 @router.get("/projeto/{projeto_id}", response_model=List[schemas.TaskRead])
 async def read_tasks_by_projeto(
     projeto_id: int,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Projection = Depends(task_fields),
     db: AsyncSession = Depends(database.get_db)
 ):
-    result = await db.execute(
+    order = primary_key_order(models.Task)
+    return await fetch_page(
+        db,
         select(models.Task)
-        .where(models.Task.projeto_id == projeto_id)
+        .where(models.Task.projeto_id == projeto_id),
+        page,
+        order,
+        response,
+        fields
     )
-    return result.scalars().all()
 
 @router.get("/status/{status}", response_model=List[schemas.TaskRead])
 async def read_tasks_by_status(
-    status: str,
+    response: Response,
+    task_status: str = Path(alias="status"),
+    page: PageParams = Depends(page_params),
+    fields: Projection = Depends(task_fields),
     db: AsyncSession = Depends(database.get_db)
 ):
-    result = await db.execute(
+    order = primary_key_order(models.Task)
+    return await fetch_page(
+        db,
         select(models.Task)
-        .where(models.Task.status == status)
+        .where(models.Task.status == task_status),
+        page,
+        order,
+        response,
+        fields
     )
-    return result.scalars().all()
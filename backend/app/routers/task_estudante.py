@@ -1,75 +1,103 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, Path
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
-from sqlalchemy.exc import IntegrityError
-from typing import List
-from .. import models, schemas, database
+from typing import List, Optional
+from .. import models, schemas, database, bulk
 from . import auth
+from ..pagination import PageParams, page_params, ids_param, fetch_page, primary_key_order
+from ..projection import FieldSet, Projection
+from ..repository import Reference, Repository
+from ..export import export_format, export_response
 
 router = APIRouter(prefix="/task-estudantes", tags=["task-estudantes"])
 
+task_estudante_references = [
+    Reference("student_id", models.Estudante.student_id, "Student not found"),
+    Reference("task_id", models.Task.task_id, "Task not found"),
+]
+
+task_estudante_repository = Repository(
+    models.TaskEstudante,
+    not_found="Task assignment not found",
+    references=task_estudante_references,
+    conflict_detail="Task is already assigned to this student",
+)
+
+task_estudante_fields = FieldSet(
+    models.TaskEstudante,
+    schemas.TaskEstudanteRead,
+    expandable={
+        "estudante": schemas.EstudanteRead,
+        "task": schemas.TaskRead,
+    },
+)
+
 @router.post("/", response_model=schemas.TaskEstudanteRead)
 async def create_task_estudante(
     task_estudante: schemas.TaskEstudanteCreate,
     db: AsyncSession = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    result = await db.execute(select(models.Estudante).where(models.Estudante.student_id == task_estudante.student_id))
-    if not result.scalars().first():
-        raise HTTPException(status_code=404, detail="Student not found")
-    
-    result = await db.execute(select(models.Task).where(models.Task.task_id == task_estudante.task_id))
-    if not result.scalars().first():
-        raise HTTPException(status_code=404, detail="Task not found")
-    
-    try:
-        db_task_estudante = models.TaskEstudante(**task_estudante.dict())
-        db.add(db_task_estudante)
-        await db.commit()
-        await db.refresh(db_task_estudante)
-        return db_task_estudante
-    except IntegrityError:
-        await db.rollback()
-        raise HTTPException(
-            status_code=400, 
-            detail="Task is already assigned to this student"
-        )
+    return await task_estudante_repository.create(db, task_estudante)
+
+@router.post("/bulk", response_model=List[schemas.BulkItemResult])
+async def create_task_estudantes_bulk(
+    task_estudantes: List[schemas.TaskEstudanteCreate],
+    db: AsyncSession = Depends(database.get_db),
+    current_user: models.User = Depends(auth.get_current_user)
+):
+    bulk.check_size(task_estudantes)
+    return await bulk.bulk_create(
+        db,
+        models.TaskEstudante,
+        schemas.TaskEstudanteRead,
+        task_estudantes,
+        references=task_estudante_references,
+        unique=("student_id", "task_id"),
+        duplicate_detail=task_estudante_repository.conflict_detail,
+    )
 
 @router.get("/", response_model=List[schemas.TaskEstudanteRead])
 async def read_task_estudantes(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Projection = Depends(task_estudante_fields),
+    ids: Optional[List[int]] = Depends(ids_param),
     db: AsyncSession = Depends(database.get_db)
 ):
-    result = await db.execute(
-        select(models.TaskEstudante)
-        .options(
-            selectinload(models.TaskEstudante.estudante),
-            selectinload(models.TaskEstudante.task)
-        )
-        .offset(skip)
-        .limit(limit)
+    order = primary_key_order(models.TaskEstudante)
+    return await fetch_page(
+        db,
+        select(models.TaskEstudante),
+        page,
+        order,
+        response,
+        fields,
+        ids
     )
-    return result.scalars().all()
+
+@router.get("/export")
+async def export_task_estudantes(
+    format: str = Depends(export_format),
+    sessions=Depends(database.session_factory)
+):
+    return export_response(sessions, models.TaskEstudante, schemas.TaskEstudanteRead, format)
 
 @router.get("/{estud_task_id}", response_model=schemas.TaskEstudanteRead)
 async def read_task_estudante(
     estud_task_id: int,
+    fields: Projection = Depends(task_estudante_fields),
     db: AsyncSession = Depends(database.get_db)
 ):
     result = await db.execute(
         select(models.TaskEstudante)
-        .options(
-            selectinload(models.TaskEstudante.estudante),
-            selectinload(models.TaskEstudante.task)
-        )
+        .options(*fields.options())
         .where(models.TaskEstudante.estud_task_id == estud_task_id)
     )
     task_estudante = result.scalars().first()
     if task_estudante is None:
         raise HTTPException(status_code=404, detail="Task assignment not found")
-    return task_estudante
+    return fields.render(task_estudante)
 
 @router.put("/{estud_task_id}", response_model=schemas.TaskEstudanteRead)
 async def update_task_estudante(
@@ -78,18 +106,7 @@ async def update_task_estudante(
     db: AsyncSession = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    result = await db.execute(select(models.TaskEstudante).where(models.TaskEstudante.estud_task_id == estud_task_id))
-    db_task_estudante = result.scalars().first()
-    if db_task_estudante is None:
-        raise HTTPException(status_code=404, detail="Task assignment not found")
-    
-    update_data = task_estudante_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_task_estudante, field, value)
-    
-    await db.commit()
-    await db.refresh(db_task_estudante)
-    return db_task_estudante
+    return await task_estudante_repository.update(db, estud_task_id, task_estudante_update.model_dump(exclude_unset=True))
 
 @router.delete("/{estud_task_id}")
 async def delete_task_estudante(
@@ -97,50 +114,62 @@ async def delete_task_estudante(
     db: AsyncSession = Depends(database.get_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    result = await db.execute(select(models.TaskEstudante).where(models.TaskEstudante.estud_task_id == estud_task_id))
-    db_task_estudante = result.scalars().first()
-    if db_task_estudante is None:
-        raise HTTPException(status_code=404, detail="Task assignment not found")
-    
-    await db.delete(db_task_estudante)
-    await db.commit()
+    await task_estudante_repository.delete(db, estud_task_id)
     return {"message": "Task assignment deleted successfully"}
 
 @router.get("/student/{student_id}", response_model=List[schemas.TaskEstudanteRead])
 async def read_task_estudantes_by_student(
     student_id: int,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Projection = Depends(task_estudante_fields),
     db: AsyncSession = Depends(database.get_db)
 ):
-    result = await db.execute(
+    order = primary_key_order(models.TaskEstudante)
+    return await fetch_page(
+        db,
         select(models.TaskEstudante)
-        .options(selectinload(models.TaskEstudante.task))
-        .where(models.TaskEstudante.student_id == student_id)
+        .where(models.TaskEstudante.student_id == student_id),
+        page,
+        order,
+        response,
+        fields
     )
-    return result.scalars().all()
 
 @router.get("/task/{task_id}", response_model=List[schemas.TaskEstudanteRead])
 async def read_task_estudantes_by_task(
     task_id: int,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Projection = Depends(task_estudante_fields),
     db: AsyncSession = Depends(database.get_db)
 ):
-    result = await db.execute(
+    order = primary_key_order(models.TaskEstudante)
+    return await fetch_page(
+        db,
         select(models.TaskEstudante)
-        .options(selectinload(models.TaskEstudante.estudante))
-        .where(models.TaskEstudante.task_id == task_id)
+        .where(models.TaskEstudante.task_id == task_id),
+        page,
+        order,
+        response,
+        fields
     )
-    return result.scalars().all()
 
 @router.get("/status/{status}", response_model=List[schemas.TaskEstudanteRead])
 async def read_task_estudantes_by_status(
-    status: str,
+    response: Response,
+    assignment_status: str = Path(alias="status"),
+    page: PageParams = Depends(page_params),
+    fields: Projection = Depends(task_estudante_fields),
     db: AsyncSession = Depends(database.get_db)
 ):
-    result = await db.execute(
+    order = primary_key_order(models.TaskEstudante)
+    return await fetch_page(
+        db,
         select(models.TaskEstudante)
-        .options(
-            selectinload(models.TaskEstudante.estudante),
-            selectinload(models.TaskEstudante.task)
-        )
-        .where(models.TaskEstudante.status == status)
+        .where(models.TaskEstudante.status == assignment_status),
+        page,
+        order,
+        response,
+        fields
     )
-    return result.scalars().all()
@@ -1,37 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import io
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import update
-from typing import List
-
-from ..database import get_db
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
+
+from ..database import get_db, session_factory, unique_violation_columns
+from ..pagination import PageParams, page_params, ids_param, fetch_page, primary_key_order
+from ..projection import FieldSet, Projection
+from ..repository import Repository
+from ..export import export_format, export_response
+from .. import roster
 from ..models import User
-from ..schemas import UserRead, UserCreate, UserUpdate, UserInDB
-from ..routers.auth import get_current_user, get_password_hash  # importa funções corretas
+from ..schemas import UserRead, UserCreate, UserUpdate, UserInDB, RosterImportResult
+from .admin import require_admin
+from ..routers.auth import get_current_user, get_password_hash_async, invalidate_cached_user, revoke_user_tokens, revokes_tokens  # importa funções corretas
 
 router = APIRouter(prefix="/users", tags=["users"])
 
-# Helper para verificar unicidade
-async def _check_unique_user(
-    db: AsyncSession, 
-    username: str = None, 
-    email: str = None, 
-    exclude_id: int = None
-):
-    query = select(User)
-    conditions = []
-    if username:
-        conditions.append(User.username == username)
-    if email:
-        conditions.append(User.email == email)
-    
-    if conditions:
-        query = query.where(*conditions)
-    if exclude_id:
-        query = query.where(User.user_id != exclude_id)
-    
-    result = await db.execute(query)
-    return result.scalars().first()
+user_fields = FieldSet(User, UserRead)
+
+user_repository = Repository(User, not_found="User not found")
+
+# Unicidade garantida pelas constraints UNIQUE de username/email:
+# traduz a violação para uma mensagem que indica qual campo colidiu.
+# Outros IntegrityError (FK, NOT NULL) não são "já cadastrado" e sobem.
+def _unique_violation_detail(exc: IntegrityError, suffix: str) -> str:
+    columns = unique_violation_columns(exc)
+    if columns is None:
+        raise exc
+    if "email" in columns:
+        return f"Email {suffix}"
+    if "username" in columns:
+        return f"Username {suffix}"
+    return f"Username or email {suffix}"
 
 
 @router.post("/", response_model=UserRead, status_code=status.HTTP_201_CREATED)
@@ -39,38 +43,76 @@ async def create_user(
     user: UserCreate, 
     db: AsyncSession = Depends(get_db)
 ):
-    if await _check_unique_user(db, user.username, user.email):
+    # Hash antes de tocar no banco: nenhuma conexão fica presa durante o bcrypt
+    hashed_password = await get_password_hash_async(user.password)
+
+    try:
+        result = await db.execute(
+            insert(User)
+            .values(
+                username=user.username,
+                email=user.email,
+                password=hashed_password,
+                role=user.role
+            )
+            .returning(User)
+        )
+        db_user = result.scalars().one()
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username or email already registered"
+            detail=_unique_violation_detail(exc, "already registered")
         )
-    
-    hashed_password = get_password_hash(user.password)
+    return db_user
+
 
-    db_user = User(
-        username=user.username,
-        email=user.email,
-        password=hashed_password,
-        role=user.role
+@router.post("/import", response_model=RosterImportResult)
+async def import_users(
+    file: UploadFile = File(...),
+    current_user: UserInDB = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    # Lê o upload (já em arquivo temporário) linha a linha, sem carregar tudo na memória
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return await roster.import_roster(db, lines)
+    finally:
+        lines.detach()
+
+
+@router.get("/import/{report_id}/errors")
+async def read_import_errors(
+    report_id: str,
+    current_user: UserInDB = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    content = await roster.read_report(db, report_id)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Import report not found")
+    return Response(
+        content=content,
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="import-{report_id}-errors.csv"'},
     )
-    db.add(db_user)
-    await db.commit()
-    await db.refresh(db_user)
-    return db_user
 
 
 @router.get("/me", response_model=UserRead)
 async def read_current_user(
+    fields: Projection = Depends(user_fields),
     current_user: UserInDB = Depends(get_current_user)
 ):
-    return current_user
+    return fields.render(current_user)
 
 
 @router.get("/", response_model=List[UserRead])
 async def read_all_users(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(page_params),
     current_user: UserInDB = Depends(get_current_user),
+    fields: Projection = Depends(user_fields),
+    ids: Optional[List[int]] = Depends(ids_param),
     db: AsyncSession = Depends(get_db)
 ):
     if current_user.role != "Admin":
@@ -79,13 +121,23 @@ async def read_all_users(
             detail="Only administrators can list users"
         )
     
-    result = await db.execute(select(User).offset(skip).limit(limit))
-    return result.scalars().all()
+    order = primary_key_order(User)
+    return await fetch_page(db, select(User), page, order, response, fields, ids)
+
+
+@router.get("/export")
+async def export_users(
+    format: str = Depends(export_format),
+    current_user: UserInDB = Depends(require_admin),
+    sessions=Depends(session_factory)
+):
+    return export_response(sessions, User, UserRead, format)
 
 
 @router.get("/{user_id}", response_model=UserRead)
 async def read_user(
     user_id: int,
+    fields: Projection = Depends(user_fields),
     current_user: UserInDB = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -95,14 +147,14 @@ async def read_user(
             detail="Not authorized to view this user"
         )
     
-    user = (await db.execute(select(User).where(User.user_id == user_id))).scalars().first()
+    user = (await db.execute(select(User).options(*fields.options()).where(User.user_id == user_id))).scalars().first()
     
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    return user
+    return fields.render(user)
 
 
 @router.put("/{user_id}", response_model=UserRead)
@@ -118,36 +170,31 @@ async def update_user(
             detail="Not authorized to update this user"
         )
     
-    update_data = user_update.dict(exclude_unset=True)
-
-    if 'username' in update_data or 'email' in update_data:
-        existing = await _check_unique_user(
-            db,
-            username=update_data.get('username'),
-            email=update_data.get('email'),
-            exclude_id=user_id
-        )
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username or email already in use"
-            )
-    
+    update_data = user_update.model_dump(exclude_unset=True)
+
     if 'password' in update_data:
-        update_data['password'] = get_password_hash(update_data['password'])
+        update_data['password'] = await get_password_hash_async(update_data['password'])
 
     if 'role' in update_data and current_user.role != "Admin":
         del update_data['role']
     
-    await db.execute(
-        update(User)
-        .where(User.user_id == user_id)
-        .values(**update_data)
-    )
-    await db.commit()
-
-    # Recarrega direto do banco (evita dependência do endpoint que pode dar erro de permissão)
-    updated_user = (await db.execute(select(User).where(User.user_id == user_id))).scalars().first()
+    # Troca de senha/papel (e de username/email com claims stateless) invalida
+    # os tokens emitidos até aqui. A coluna guarda o corte para que outros
+    # workers e reinícios o recarreguem
+    tokens_valid_after = datetime.now(timezone.utc) if revokes_tokens(update_data) else None
+    if tokens_valid_after is not None:
+        update_data['tokens_valid_after'] = tokens_valid_after
+
+    try:
+        updated_user = await user_repository.update(db, user_id, update_data)
+    except IntegrityError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=_unique_violation_detail(exc, "already in use")
+        )
+    invalidate_cached_user(user_id)
+    if tokens_valid_after is not None:
+        revoke_user_tokens(user_id, tokens_valid_after.timestamp())
     return updated_user
 
 
@@ -163,13 +210,6 @@ async def delete_user(
             detail="Only administrators can delete users"
         )
     
-    user = (await db.execute(select(User).where(User.user_id == user_id))).scalars().first()
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    
-    await db.delete(user)
-    await db.commit()
+    await user_repository.delete(db, user_id)
+    invalidate_cached_user(user_id)
+    revoke_user_tokens(user_id)
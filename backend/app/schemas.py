@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, ConfigDict
-from typing import Optional
-from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+from datetime import date, datetime
 
 class UserBase(BaseModel):
     username: str
@@ -109,8 +109,8 @@ class ProjetoBase(BaseModel):
     ngo_id: Optional[int] = None
     name: str
     description: Optional[str] = None
-    start_date: Optional[str] = None
-    end_date: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
     status: Optional[str] = None
 
 class ProjetoCreate(ProjetoBase):
@@ -125,8 +125,8 @@ class ProjetoUpdate(BaseModel):
     ngo_id: Optional[int] = None
     name: Optional[str] = None
     description: Optional[str] = None
-    start_date: Optional[str] = None
-    end_date: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
     status: Optional[str] = None 
 
 class TaskBase(BaseModel):
@@ -169,8 +169,8 @@ class MatriculaProjetosUpdate(BaseModel):
 class TaskEstudanteBase(BaseModel):
     student_id: int
     task_id: int
-    assigned_date: Optional[str] = None
-    deadline_date: Optional[str] = None
+    assigned_date: Optional[date] = None
+    deadline_date: Optional[date] = None
     status: Optional[str] = None
     description: Optional[str] = None
 
@@ -182,7 +182,117 @@ class TaskEstudanteRead(TaskEstudanteBase):
     estud_task_id: int
 
 class TaskEstudanteUpdate(BaseModel):
-    assigned_date: Optional[str] = None
-    deadline_date: Optional[str] = None
+    assigned_date: Optional[date] = None
+    deadline_date: Optional[date] = None
     status: Optional[str] = None
-    description: Optional[str] = None 
\ No newline at end of file
+    description: Optional[str] = None 
+
+class BatchItem(BaseModel):
+    id: Optional[str] = None
+    method: str = "GET"
+    path: str
+    body: Optional[Any] = None
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem]
+
+class BatchItemResult(BaseModel):
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str] = {}
+    body: Optional[Any] = None
+
+class TaskSummary(BaseModel):
+    task_id: int
+    name: str
+    type: Optional[str] = None
+    status: Optional[str] = None
+    assignments: Dict[str, int] = {}
+    overdue: int = 0
+
+class EnrolledStudent(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    matricula_id: int
+    student_id: int
+    full_name: str
+    curso: Optional[str] = None
+    status: Optional[str] = None
+    matricula_date: Optional[datetime] = None
+
+class ProjetoDashboard(BaseModel):
+    projeto: ProjetoRead
+    ong: Optional[ONGRead] = None
+    disciplina: Optional[DisciplinaRead] = None
+    tasks: List[TaskSummary] = []
+    estudantes: List[EnrolledStudent] = []
+    overdue_assignments: int = 0
+
+class EnrollmentSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    matricula_id: int
+    projeto_id: int
+    projeto_name: str
+    status: Optional[str] = None
+    matricula_date: Optional[datetime] = None
+
+class AssignmentSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    estud_task_id: int
+    task_id: int
+    task_name: str
+    projeto_id: int
+    projeto_name: str
+    status: Optional[str] = None
+    assigned_date: Optional[date] = None
+    deadline_date: Optional[date] = None
+
+class EstudanteOverview(BaseModel):
+    estudante: EstudanteRead
+    matriculas: List[EnrollmentSummary] = []
+    assignments: List[AssignmentSummary] = []
+    upcoming_deadlines: List[AssignmentSummary] = []
+
+class Portfolio(BaseModel):
+    owner_id: int
+    projects: int
+    students: int
+    open_tasks: int
+    overdue_assignments: int
+    refreshed_at: datetime
+    stale_seconds: float
+    source: str
+
+class StatsBucket(BaseModel):
+    status: str
+    disciplina_id: Optional[int] = None
+    ngo_id: Optional[int] = None
+    count: int
+
+class Stats(BaseModel):
+    group_by: List[str] = []
+    since: Optional[date] = None
+    until: Optional[date] = None
+    generated_at: datetime
+    projetos: Optional[List[StatsBucket]] = None
+    tasks: Optional[List[StatsBucket]] = None
+    assignments: Optional[List[StatsBucket]] = None
+
+class BulkItemResult(BaseModel):
+    index: int
+    status: int
+    body: Optional[Any] = None
+
+class RosterRow(BaseModel):
+    username: str
+    email: EmailStr
+    password: str
+    role: Literal["Estudante", "Professor"]
+    full_name: str
+    vinculo: Optional[str] = None
+    curso: Optional[str] = None
+    departamento: Optional[str] = None
+
+class RosterImportResult(BaseModel):
+    created: int
+    rejected: int
+    report_id: Optional[str] = None
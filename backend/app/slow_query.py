@@ -0,0 +1,90 @@
+import os
+import json
+import time
+import random
+import logging
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_SAMPLE_RATE = float(os.getenv("SLOW_QUERY_SAMPLE_RATE", "0"))
+SLOW_QUERY_MAX_STATEMENT = int(os.getenv("SLOW_QUERY_MAX_STATEMENT", "2000"))
+
+logger = logging.getLogger("app.sql.slow")
+
+# Scope ASGI da requisição corrente; a rota só é resolvida depois do roteamento,
+# por isso guardamos o dict do scope e lemos "route" apenas na hora de logar.
+_request_scope: ContextVar[Optional[dict]] = ContextVar("request_scope", default=None)
+
+
+class RequestContextMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_scope.reset(token)
+
+
+def current_route() -> Optional[str]:
+    scope = _request_scope.get()
+    if scope is None:
+        return None
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path")
+    return f"{scope.get('method')} {path}"
+
+
+def _params_shape(parameters, executemany: bool):
+    if executemany:
+        return {"executemany": len(parameters)}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _should_log(elapsed_ms: float) -> Optional[str]:
+    if elapsed_ms >= SLOW_QUERY_MS:
+        return "slow"
+    if SLOW_QUERY_SAMPLE_RATE and random.random() < SLOW_QUERY_SAMPLE_RATE:
+        return "sampled"
+    return None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_query_start", None)
+    if start is None:
+        return
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    reason = _should_log(elapsed_ms)
+    if reason is None:
+        return
+    logger.warning(json.dumps({
+        "event": "sql",
+        "reason": reason,
+        "duration_ms": round(elapsed_ms, 3),
+        "route": current_route(),
+        "statement": statement[:SLOW_QUERY_MAX_STATEMENT],
+        "params": _params_shape(parameters, executemany),
+    }, default=str))
+
+
+def install(engine):
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,90 @@
+import os
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional, Sequence
+from sqlalchemy import DateTime, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import models, schemas
+from .cache import TTLCache
+from .reports import NO_STATUS
+
+STATS_CACHE_TTL_SECONDS = float(os.getenv("STATS_CACHE_TTL_SECONDS", "60"))
+STATS_CACHE_MAX_SIZE = int(os.getenv("STATS_CACHE_MAX_SIZE", "256"))
+
+stats_cache = TTLCache(maxsize=STATS_CACHE_MAX_SIZE, ttl=STATS_CACHE_TTL_SECONDS)
+
+# Toda entidade chega ao Projeto, de onde vêm as dimensões de agrupamento
+DIMENSIONS = {
+    "disciplina": models.Projeto.disciplina_id,
+    "ong": models.Projeto.ngo_id,
+}
+
+# entidade -> (modelo, coluna da janela de datas, joins até o Projeto)
+ENTITIES = {
+    "projetos": (models.Projeto, models.Projeto.start_date, ()),
+    "tasks": (
+        models.Task,
+        models.Task.created_at,
+        ((models.Projeto, models.Projeto.projeto_id == models.Task.projeto_id),),
+    ),
+    "assignments": (
+        models.TaskEstudante,
+        models.TaskEstudante.assigned_date,
+        (
+            (models.Task, models.Task.task_id == models.TaskEstudante.task_id),
+            (models.Projeto, models.Projeto.projeto_id == models.Task.projeto_id),
+        ),
+    ),
+}
+
+
+def _window(column, since: Optional[date], until: Optional[date]) -> list:
+    conditions = []
+    if isinstance(column.type, DateTime):
+        # Timestamps: until inclui o dia inteiro
+        if since:
+            conditions.append(column >= datetime.combine(since, time.min, tzinfo=timezone.utc))
+        if until:
+            conditions.append(column < datetime.combine(until + timedelta(days=1), time.min, tzinfo=timezone.utc))
+    else:
+        if since:
+            conditions.append(column >= since)
+        if until:
+            conditions.append(column <= until)
+    return conditions
+
+
+def status_counts(entity: str, group_by: Sequence[str], since: Optional[date], until: Optional[date]):
+    model, date_column, joins = ENTITIES[entity]
+    keys = [model.status] + [DIMENSIONS[name] for name in group_by]
+    stmt = select(*keys, func.count().label("count")).select_from(model)
+    if group_by:
+        # Sem agrupamento não há join: a contagem sai só do índice de status
+        for target, onclause in joins:
+            stmt = stmt.join(target, onclause)
+    return stmt.where(*_window(date_column, since, until)).group_by(*keys).order_by(*keys)
+
+
+async def read_stats(
+    db: AsyncSession,
+    entities: Sequence[str],
+    group_by: Sequence[str],
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+) -> schemas.Stats:
+    key = (tuple(entities), tuple(group_by), since, until)
+    cached = stats_cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = schemas.Stats(group_by=list(group_by), since=since, until=until, generated_at=datetime.now(timezone.utc))
+    for entity in entities:
+        rows = await db.execute(status_counts(entity, group_by, since, until))
+        buckets = []
+        for row in rows:
+            bucket = schemas.StatsBucket(status=row[0] or NO_STATUS, count=row.count)
+            for name, value in zip(group_by, row[1:-1]):
+                setattr(bucket, DIMENSIONS[name].key, value)
+            buckets.append(bucket)
+        setattr(result, entity, buckets)
+    stats_cache.set(key, result)
+    return result
@@ -0,0 +1,152 @@
+import os
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+from sqlalchemy import case, delete, select
+from . import database, models
+
+# Limites de tentativas de login: taxa em tentativas/minuto e rajada máxima
+LOGIN_IP_RATE = float(os.getenv("LOGIN_IP_RATE", "30"))
+LOGIN_IP_BURST = float(os.getenv("LOGIN_IP_BURST", "10"))
+LOGIN_USERNAME_RATE = float(os.getenv("LOGIN_USERNAME_RATE", "10"))
+LOGIN_USERNAME_BURST = float(os.getenv("LOGIN_USERNAME_BURST", "5"))
+THROTTLE_MAX_KEYS = int(os.getenv("THROTTLE_MAX_KEYS", "100000"))
+# memory (por processo) ou database (tabela Throttle_bucket, compartilhada entre workers)
+THROTTLE_BACKEND = os.getenv("THROTTLE_BACKEND", "memory")
+# Buckets sem uso há mais que isso já estão cheios e são apagados da tabela
+THROTTLE_BUCKET_TTL_SECONDS = float(os.getenv("THROTTLE_BUCKET_TTL_SECONDS", "3600"))
+THROTTLE_PRUNE_EVERY = int(os.getenv("THROTTLE_PRUNE_EVERY", "1000"))
+
+def _check_limits(name: str, rate_per_minute: float, burst: float):
+    # Taxa zero nunca repõe fichas: a espera seria infinita
+    if rate_per_minute <= 0:
+        raise ValueError(f"{name}_RATE must be positive, got {rate_per_minute}")
+    if burst < 1:
+        raise ValueError(f"{name}_BURST must be at least 1, got {burst}")
+
+
+class ThrottleBackend(ABC):
+    """Armazena os token buckets."""
+
+    @abstractmethod
+    async def take(self, key: str, rate_per_minute: float, burst: float) -> float:
+        """Consome uma ficha do bucket; retorna 0 se permitido ou os segundos até a próxima ficha."""
+
+
+class InMemoryThrottleBackend(ThrottleBackend):
+    """Buckets do processo: com vários workers cada um aplica o limite sozinho."""
+
+    def __init__(self, max_keys: int = THROTTLE_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, rate_per_minute: float, burst: float) -> float:
+        now = time.monotonic()
+        rate = rate_per_minute / 60.0
+        tokens, updated = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            wait = 0.0
+        else:
+            self._buckets[key] = (tokens, now)
+            wait = (1 - tokens) / rate
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class DatabaseThrottleBackend(ThrottleBackend):
+    """Buckets na tabela Throttle_bucket, compartilhados por todos os workers.
+
+    Cada ``take`` é um único upsert: a ficha só é consumida (e a linha só é
+    atualizada) quando o bucket reabastecido tem ao menos uma, então tentativas
+    simultâneas em workers diferentes não gastam a mesma ficha.
+    """
+
+    def __init__(self, session_factory=None, bucket_ttl: float = THROTTLE_BUCKET_TTL_SECONDS):
+        self.session_factory = session_factory
+        self.bucket_ttl = bucket_ttl
+        self._takes = 0
+
+    async def take(self, key: str, rate_per_minute: float, burst: float) -> float:
+        now = time.time()
+        rate = rate_per_minute / 60.0
+        bucket = models.ThrottleBucket
+        refilled = bucket.tokens + (now - bucket.updated_at) * rate
+        refilled = case((refilled > burst, burst), else_=refilled)
+        async with (self.session_factory or database.AsyncSessionLocal)() as session:
+            insert = database.UPSERT_INSERTS[session.get_bind().dialect.name](bucket)
+            stmt = (
+                insert.values(bucket_key=key, tokens=burst - 1, updated_at=now)
+                .on_conflict_do_update(
+                    index_elements=[bucket.bucket_key],
+                    set_={"tokens": refilled - 1, "updated_at": now},
+                    where=refilled >= 1,
+                )
+                .returning(bucket.tokens)
+            )
+            allowed = (await session.execute(stmt)).first() is not None
+            if not allowed:
+                # Sem ficha a linha fica como estava: a espera sai do último estado gravado
+                tokens, updated = (await session.execute(
+                    select(bucket.tokens, bucket.updated_at).where(bucket.bucket_key == key)
+                )).one()
+            self._takes += 1
+            if self._takes % THROTTLE_PRUNE_EVERY == 0:
+                await session.execute(delete(bucket).where(bucket.updated_at < now - self.bucket_ttl))
+            await session.commit()
+        if allowed:
+            return 0.0
+        tokens = min(burst, tokens + (now - updated) * rate)
+        return max((1 - tokens) / rate, 1e-3)
+
+
+BACKENDS = {"memory": InMemoryThrottleBackend, "database": DatabaseThrottleBackend}
+
+
+def make_backend(name: str = THROTTLE_BACKEND) -> ThrottleBackend:
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown THROTTLE_BACKEND {name!r}; expected one of {', '.join(BACKENDS)}")
+
+
+class LoginThrottle:
+    def __init__(self, backend: Optional[ThrottleBackend] = None):
+        # Limites validados uma vez: configuração inválida falha no startup, não em cada login
+        self.ip_limit = (LOGIN_IP_RATE, LOGIN_IP_BURST)
+        self.username_limit = (LOGIN_USERNAME_RATE, LOGIN_USERNAME_BURST)
+        _check_limits("LOGIN_IP", *self.ip_limit)
+        _check_limits("LOGIN_USERNAME", *self.username_limit)
+        self.backend = backend or make_backend()
+        self.allowed = 0
+        self.throttled_ip = 0
+        self.throttled_username = 0
+
+    async def check(self, client_ip: str, username: str) -> Optional[int]:
+        """Retorna None se a tentativa pode seguir, ou o Retry-After em segundos."""
+        wait = await self.backend.take(f"login:ip:{client_ip}", *self.ip_limit)
+        if wait:
+            self.throttled_ip += 1
+            return max(1, math.ceil(wait))
+        wait = await self.backend.take(f"login:user:{username.lower()}", *self.username_limit)
+        if wait:
+            self.throttled_username += 1
+            return max(1, math.ceil(wait))
+        self.allowed += 1
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "allowed": self.allowed,
+            "throttled_ip": self.throttled_ip,
+            "throttled_username": self.throttled_username,
+        }
+
+
+login_throttle = LoginThrottle()
@@ -10,8 +10,13 @@ from app.routers import projeto as projeto_router
 from app.routers import task as task_router
 from app.routers import matricula_projetos as matricula_projetos_router
 from app.routers import task_estudante as task_estudante_router
+from app.routers import admin as admin_router
+from app.routers import batch as batch_router
+from app.routers import stats as stats_router
+from app import slow_query
+from app.lifespan import lifespan
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost",
@@ -26,8 +31,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-Total-Count-Source", "X-Missing-Ids", "Content-Disposition"],
 )
 
+app.add_middleware(slow_query.RequestContextMiddleware)
+
 app.include_router(auth_router.router)
 app.include_router(user_router.router)
 app.include_router(professor_router.router)
@@ -38,6 +46,9 @@ app.include_router(projeto_router.router)
 app.include_router(task_router.router)
 app.include_router(matricula_projetos_router.router)
 app.include_router(task_estudante_router.router)
+app.include_router(admin_router.router)
+app.include_router(batch_router.router)
+app.include_router(stats_router.router)
 
 @app.get("/")
 def root():
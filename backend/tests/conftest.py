@@ -5,10 +5,12 @@ import os
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from app.database import get_db
+from app.database import get_db, session_factory
 from app.models import Base
 from app.routers.auth import get_current_user
 from app import models
+from app.counting import count_cache
+from app.stats import stats_cache
 from main import app
 
 # Test DB URL
@@ -37,6 +39,7 @@ def override_get_current_user():
     )
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[session_factory] = lambda: TestingSessionLocal
 app.dependency_overrides[get_current_user] = override_get_current_user
 
 # Fixtures
@@ -53,6 +56,8 @@ async def setup_database():
     yield
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+    count_cache.clear()
+    stats_cache.clear()
 
 @pytest_asyncio.fixture
 async def client(setup_database):
@@ -0,0 +1,83 @@
+import pytest
+from unittest.mock import patch
+from httpx import AsyncClient
+from starlette.requests import Request
+from app import database
+from app.database import PoolStats
+from app.lifespan import warm_up
+
+
+@pytest.mark.asyncio
+async def test_read_metrics_pool(client: AsyncClient):
+    response = await client.get("/admin/metrics")
+    assert response.status_code == 200
+    pool = response.json()["pool"]
+    assert pool["mode"] in ("queue", "pgbouncer")
+    for key in ("checkouts", "checkout_timeouts", "wait_avg_ms", "wait_max_ms"):
+        assert key in pool
+
+
+def test_pool_stats_records_waits():
+    stats = PoolStats()
+    stats.record(0.010)
+    stats.record(0.030)
+    stats.record(5.0, timed_out=True)
+    snapshot = stats.snapshot()
+    assert snapshot["checkouts"] == 2
+    assert snapshot["checkout_timeouts"] == 1
+    assert snapshot["wait_avg_ms"] == pytest.approx(20.0)
+    assert snapshot["wait_max_ms"] == pytest.approx(30.0)
+
+
+def _request(method: str, token: str = "Bearer reader"):
+    return Request({
+        "type": "http",
+        "method": method,
+        "path": "/",
+        "headers": [(b"authorization", token.encode())],
+        "client": ("127.0.0.1", 1234),
+    })
+
+
+@pytest.mark.asyncio
+async def test_get_db_routes_reads_to_read_session():
+    gen = database.get_db(_request("GET", "Bearer only-reads"))
+    session = await gen.__anext__()
+    assert session.autoflush is False
+    assert session.bind is not database.engine
+    assert session.bind.get_execution_options()["postgresql_readonly"] is True
+    await gen.aclose()
+
+
+@pytest.mark.asyncio
+async def test_get_db_read_your_writes():
+    gen = database.get_db(_request("POST", "Bearer writer"))
+    session = await gen.__anext__()
+    assert session.bind is database.engine
+    await gen.aclose()
+
+    gen = database.get_db(_request("GET", "Bearer writer"))
+    session = await gen.__anext__()
+    assert session.bind is database.engine
+    await gen.aclose()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_reports_startup_breakdown(setup_database):
+    from tests.conftest import test_engine
+    from main import app
+    with patch.object(database, "engine", test_engine), patch.object(database, "read_engine", test_engine):
+        timings = await warm_up(app)
+    for step in ("configure_mappers", "bcrypt_backend", "pool", "openapi", "total"):
+        assert step in timings
+        assert "error" not in timings[step]
+    assert test_engine.sync_engine.pool.checkedin() >= 1
+
+
+def test_warmup_connections_clamped_to_pool_capacity(monkeypatch):
+    from app.lifespan import warmup_connections
+    monkeypatch.setattr(database, "DB_POOL_SIZE", 2)
+    monkeypatch.setattr(database, "DB_MAX_OVERFLOW", 3)
+    assert warmup_connections(4) == 4
+    assert warmup_connections(50) == 5
+
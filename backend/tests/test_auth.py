@@ -0,0 +1,265 @@
+import time
+import pytest
+from unittest.mock import patch
+from fastapi import HTTPException
+from httpx import AsyncClient
+from app import hashing, models, throttle
+from app.cache import TTLCache
+from app.hashing import HashPool
+from app.revocation import RevocationList
+from app.routers import auth
+from app.throttle import InMemoryThrottleBackend, LoginThrottle
+from tests.conftest import TestingSessionLocal
+
+
+def test_ttl_cache_lru_and_expiry():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    cache.set("d", 4, ttl=-1)
+    assert cache.get("d") is None
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+    assert stats["evictions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_uses_cache(setup_database, db_session, sample_user):
+    auth.user_cache.clear()
+    token = auth.create_access_token({"sub": sample_user.username})
+    with patch.object(auth, "get_user_by_username", wraps=auth.get_user_by_username) as lookup:
+        first = await auth.get_current_user(token=token, db=db_session)
+        second = await auth.get_current_user(token=token, db=db_session)
+    assert first.user_id == second.user_id == sample_user.user_id
+    assert lookup.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_user_invalidate_cache(client: AsyncClient, sample_user):
+    auth.user_cache.clear()
+    auth.user_cache.set(sample_user.username, sample_user)
+    response = await client.put(f"/users/{sample_user.user_id}", json={"email": "changed@example.com"})
+    assert response.status_code == 200
+    assert auth.user_cache.get(sample_user.username) is None
+
+    auth.user_cache.set(sample_user.username, sample_user)
+    response = await client.delete(f"/users/{sample_user.user_id}")
+    assert response.status_code == 204
+    assert auth.user_cache.get(sample_user.username) is None
+
+
+@pytest.mark.asyncio
+async def test_stateless_token_skips_database(monkeypatch):
+    monkeypatch.setattr(auth, "JWT_STATELESS_CLAIMS", True)
+    user = models.User(user_id=42, username="stateless", email="s@example.com", role="Admin")
+    claims = auth.token_claims(user)
+    assert {"uid", "role", "email", "jti"} <= claims.keys()
+    token = auth.create_access_token(claims)
+    with patch.object(auth, "get_user_by_username") as lookup:
+        current = await auth.get_current_user(token=token, db=None)
+    lookup.assert_not_called()
+    assert current.user_id == 42
+    assert current.role == "Admin"
+
+
+@pytest.mark.asyncio
+async def test_revoked_user_token_rejected(monkeypatch):
+    monkeypatch.setattr(auth, "JWT_STATELESS_CLAIMS", True)
+    user = models.User(user_id=43, username="revoked", email="r@example.com", role="Estudante")
+    token = auth.create_access_token(auth.token_claims(user))
+    auth.revoke_user_tokens(43)
+    with pytest.raises(HTTPException) as exc_info:
+        await auth.get_current_user(token=token, db=None)
+    assert exc_info.value.status_code == 401
+
+    fresh = auth.create_access_token(auth.token_claims(user))
+    assert (await auth.get_current_user(token=fresh, db=None)).user_id == 43
+
+
+def test_revocation_list_prunes_expired_entries():
+    revocations = RevocationList(token_lifetime_seconds=60)
+    revocations.revoke_user(1, at=time.time() - 120)
+    revocations.revoke_user(2)
+    revocations.revoke_token("old", expires_at=time.time() - 1)
+    revocations.prune()
+    assert revocations.stats() == {"users": 1, "tokens": 0}
+    assert revocations.is_revoked({"uid": 2, "iat": time.time() - 10})
+
+
+@pytest.mark.asyncio
+async def test_profile_update_keeps_session_in_default_mode(client: AsyncClient, sample_user, monkeypatch):
+    from main import app
+    monkeypatch.setattr(auth, "JWT_STATELESS_CLAIMS", False)
+    token = auth.create_access_token(auth.token_claims(sample_user))
+    override = app.dependency_overrides.pop(auth.get_current_user)
+    try:
+        headers = {"Authorization": f"Bearer {token}"}
+        response = await client.put(f"/users/{sample_user.user_id}", json={"email": "new@example.com"}, headers=headers)
+        assert response.status_code == 200
+        assert (await client.get("/users/me", headers=headers)).status_code == 200
+    finally:
+        app.dependency_overrides[auth.get_current_user] = override
+
+    revocations = RevocationList(token_lifetime_seconds=60)
+    async with TestingSessionLocal() as session:
+        await revocations.load(session)
+    assert revocations.stats()["users"] == 0
+
+
+@pytest.mark.asyncio
+async def test_password_change_revokes_tokens(client: AsyncClient, sample_user, sample_estudante):
+    response = await client.put(f"/users/{sample_user.user_id}", json={"password": "nova-senha"})
+    assert response.status_code == 200
+
+    revocations = RevocationList(token_lifetime_seconds=60)
+    async with TestingSessionLocal() as session:
+        await revocations.load(session)
+    # sample_estudante tem updated_at recente, mas nenhuma troca de credencial
+    assert revocations.stats()["users"] == 1
+    assert revocations.is_revoked({"uid": sample_user.user_id, "iat": time.time() - 5})
+    assert not revocations.is_revoked({"uid": sample_user.user_id, "iat": time.time() + 1})
+    assert auth.revocation_list.is_revoked({"uid": sample_user.user_id, "iat": time.time() - 5})
+
+
+def test_stateless_claims_revoke_on_email_change(monkeypatch):
+    monkeypatch.setattr(auth, "JWT_STATELESS_CLAIMS", False)
+    assert not auth.revokes_tokens({"email": "x@example.com", "username": "x"})
+    assert auth.revokes_tokens({"role": "Admin"})
+    monkeypatch.setattr(auth, "JWT_STATELESS_CLAIMS", True)
+    assert auth.revokes_tokens({"email": "x@example.com"})
+
+
+@pytest.mark.asyncio
+async def test_hash_pool_runs_off_loop_and_tracks_latency():
+    pool = HashPool(workers=2, queue_limit=4)
+    hashed = await pool.hash("segredo")
+    assert await pool.verify("segredo", hashed)
+    assert not await pool.verify("errado", hashed)
+    stats = pool.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["hash"]["completed"] == 1
+    assert stats["verify"]["completed"] == 2
+    assert stats["verify"]["latency_max_ms"] > 0
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_create_user_returns_503_when_hash_queue_full(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(auth.hash_pool, "queue_limit", 0)
+    response = await client.post("/users/", json={
+        "username": "burst", "email": "burst@example.com", "password": "x", "role": "Estudante"
+    })
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert auth.hash_pool.stats()["hash"]["rejected"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_login_throttled_before_database(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(throttle, "LOGIN_USERNAME_BURST", 2)
+    monkeypatch.setattr(auth, "login_throttle", LoginThrottle(InMemoryThrottleBackend()))
+    form = {"username": "victim", "password": "wrong"}
+    for _ in range(2):
+        response = await client.post("/auth/token", data=form)
+        assert response.status_code == 401
+
+    with patch.object(auth, "authenticate_user") as authenticate:
+        response = await client.post("/auth/token", data=form)
+    authenticate.assert_not_called()
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert auth.login_throttle.stats()["throttled_username"] == 1
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refills():
+    backend = InMemoryThrottleBackend()
+    assert await backend.take("k", rate_per_minute=60, burst=1) == 0
+    wait = await backend.take("k", rate_per_minute=60, burst=1)
+    assert 0 < wait <= 1
+
+
+@pytest.mark.asyncio
+async def test_database_throttle_shares_buckets(setup_database):
+    first = throttle.DatabaseThrottleBackend(session_factory=TestingSessionLocal)
+    second = throttle.DatabaseThrottleBackend(session_factory=TestingSessionLocal)
+    assert await first.take("k", rate_per_minute=60, burst=2) == 0
+    assert await second.take("k", rate_per_minute=60, burst=2) == 0
+    # Outro worker, mesma tabela: a rajada já foi gasta
+    wait = await first.take("k", rate_per_minute=60, burst=2)
+    assert 0 < wait <= 1
+    assert await second.take("other", rate_per_minute=60, burst=2) == 0
+
+
+def test_throttle_rejects_invalid_limits_at_construction(monkeypatch):
+    monkeypatch.setattr(throttle, "LOGIN_IP_RATE", 0)
+    with pytest.raises(ValueError, match="LOGIN_IP_RATE"):
+        LoginThrottle(InMemoryThrottleBackend())
+    monkeypatch.setattr(throttle, "LOGIN_IP_RATE", 30)
+    monkeypatch.setattr(throttle, "LOGIN_USERNAME_BURST", 0.5)
+    with pytest.raises(ValueError, match="LOGIN_USERNAME_BURST"):
+        LoginThrottle(InMemoryThrottleBackend())
+    with pytest.raises(ValueError):
+        throttle.make_backend("redis")
+    with pytest.raises(TypeError):
+        throttle.ThrottleBackend()
+
+
+def test_calibrate_picks_highest_cost_within_target(monkeypatch):
+    monkeypatch.setattr(hashing, "measure", lambda rounds, samples=3: 2 ** (rounds - 4))
+    rounds, timings = hashing.calibrate(target_ms=60, min_rounds=4, max_rounds=12)
+    assert rounds == 9
+    assert max(timings) == 10
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_hash(client: AsyncClient, db_session, monkeypatch):
+    monkeypatch.setattr(auth, "login_throttle", LoginThrottle(InMemoryThrottleBackend()))
+    old_hash = hashing.build_context(4).hash("segredo")
+    user = models.User(username="legacy", email="legacy@example.com", password=old_hash, role="Estudante")
+    db_session.add(user)
+    await db_session.commit()
+
+    rehashed = []
+    original_rehash = auth.rehash_password
+
+    async def fake_rehash(user_id, password, previous, session_factory=None):
+        await original_rehash(user_id, password, previous, session_factory=TestingSessionLocal)
+        rehashed.append(user_id)
+    monkeypatch.setattr(auth, "rehash_password", fake_rehash)
+
+    response = await client.post("/auth/token", data={"username": "legacy", "password": "segredo"})
+    assert response.status_code == 200
+    assert rehashed == [user.user_id]
+
+    await db_session.refresh(user)
+    assert user.password != old_hash
+    assert not hashing.needs_rehash(user.password)
+    assert hashing.pwd_context.verify("segredo", user.password)
+
+
+@pytest.mark.asyncio
+async def test_rehash_keeps_tokens_valid_and_logs_failures(setup_database, db_session, monkeypatch, caplog):
+    old_hash = hashing.build_context(4).hash("segredo")
+    user = models.User(username="legacy", email="legacy@example.com", password=old_hash, role="Estudante")
+    db_session.add(user)
+    await db_session.commit()
+
+    await auth.rehash_password(user.user_id, "segredo", old_hash, session_factory=TestingSessionLocal)
+    await db_session.refresh(user)
+    assert user.password != old_hash
+    # Rehash não é troca de credencial: nenhum corte de revogação
+    assert user.tokens_valid_after is None
+
+    async def busy(password):
+        raise hashing.HashQueueFull()
+    monkeypatch.setattr(auth.hash_pool, "hash", busy)
+    with caplog.at_level("INFO", logger="app.auth"):
+        await auth.rehash_password(user.user_id, "segredo", user.password, session_factory=TestingSessionLocal)
+    assert "hash pool busy" in caplog.text
+
@@ -0,0 +1,74 @@
+import pytest
+from unittest.mock import patch
+from httpx import AsyncClient
+from app.routers import auth
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_reads_and_writes_in_order(client: AsyncClient, sample_ong, sample_projeto):
+    response = await client.post("/batch/", json={"requests": [
+        {"id": "ong", "path": f"/ongs/{sample_ong.ngo_id}?fields=ngo_name"},
+        {"id": "projetos", "path": "/projetos/?limit=1&count=true"},
+        {"id": "nova", "method": "POST", "path": "/ongs/", "body": {"ngo_name": "Nova ONG"}},
+        {"id": "lista", "path": "/ongs/"},
+        {"id": "falta", "path": "/tasks/999999"},
+    ]})
+    assert response.status_code == 200
+    items = {item["id"]: item for item in response.json()}
+    assert [item["id"] for item in response.json()] == ["ong", "projetos", "nova", "lista", "falta"]
+    assert items["ong"]["body"] == {"ngo_id": sample_ong.ngo_id, "ngo_name": "Test NGO"}
+    assert items["projetos"]["headers"]["x-total-count"] == "1"
+    assert items["nova"]["status"] in (200, 201)
+    assert [o["ngo_name"] for o in items["lista"]["body"]] == ["Test NGO", "Nova ONG"]
+    assert items["falta"]["status"] == 404
+
+
+@pytest.mark.asyncio
+async def test_batch_authenticates_once(client: AsyncClient, sample_user, monkeypatch):
+    from main import app
+    # Autenticação real: o token é validado só no /batch
+    monkeypatch.delitem(app.dependency_overrides, auth.get_current_user)
+    auth.user_cache.clear()
+    token = auth.create_access_token({"sub": sample_user.username})
+    with patch.object(auth, "get_user_by_username", wraps=auth.get_user_by_username) as lookup:
+        response = await client.post(
+            "/batch/",
+            json={"requests": [{"path": "/users/me"}, {"path": f"/users/{sample_user.user_id}?fields=username"}]},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+    assert response.status_code == 200
+    assert [item["body"]["username"] for item in response.json()] == [sample_user.username] * 2
+    assert lookup.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_nesting_and_oversize(client: AsyncClient):
+    response = await client.post("/batch/", json={"requests": [{"method": "POST", "path": "/batch/"}]})
+    assert response.json()[0]["status"] == 400
+    response = await client.post("/batch/", json={"requests": [{"path": "/ongs/"}] * 100})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_batch_marks_only_write_subrequests(client: AsyncClient, sample_ong, monkeypatch):
+    from main import app
+    from app import database
+    from tests.conftest import TestingSessionLocal
+    # get_db real (com read-your-writes) sobre o banco de teste
+    monkeypatch.delitem(app.dependency_overrides, database.get_db)
+    monkeypatch.setattr(database, "AsyncSessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(database, "ReadSessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(database, "_recent_writers", {})
+    headers = {"Authorization": "Bearer batch-client"}
+
+    response = await client.post("/batch/", json={"requests": [{"path": "/ongs/"}, {"path": "/projetos/"}]}, headers=headers)
+    assert response.status_code == 200
+    assert not database._wrote_recently("Bearer batch-client")
+
+    response = await client.post(
+        "/batch/",
+        json={"requests": [{"method": "POST", "path": "/ongs/", "body": {"ngo_name": "Nova"}}]},
+        headers=headers,
+    )
+    assert response.json()[0]["status"] == 201
+    assert database._wrote_recently("Bearer batch-client")
@@ -105,3 +105,38 @@ async def test_delete_estudante(client: AsyncClient):
 
     response = await client.get(f"/estudantes/{student_id}")
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_estudante_overview(client: AsyncClient, db_session, sample_estudante, sample_task):
+    from datetime import date, timedelta
+    from app import models
+    today = date.today()
+    other = models.Task(projeto_id=sample_task.projeto_id, name="Relatório")
+    done = models.Task(projeto_id=sample_task.projeto_id, name="Entregue")
+    db_session.add_all([other, done])
+    await db_session.flush()
+    db_session.add_all([
+        models.MatriculaProjetos(student_id=sample_estudante.student_id, projeto_id=sample_task.projeto_id, status="Ativo"),
+        models.TaskEstudante(student_id=sample_estudante.student_id, task_id=sample_task.task_id,
+                             status="Atribuída", deadline_date=today + timedelta(days=30)),
+        models.TaskEstudante(student_id=sample_estudante.student_id, task_id=other.task_id,
+                             status="Em Andamento", deadline_date=today + timedelta(days=3)),
+        models.TaskEstudante(student_id=sample_estudante.student_id, task_id=done.task_id,
+                             status="Concluída", deadline_date=today + timedelta(days=1)),
+    ])
+    await db_session.commit()
+
+    response = await client.get(f"/estudantes/{sample_estudante.student_id}/overview", params={"days": 7})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["estudante"]["student_id"] == sample_estudante.student_id
+    assert [m["projeto_name"] for m in data["matriculas"]] == ["Test Project"]
+    assert [a["task_name"] for a in data["assignments"]] == ["Entregue", "Relatório", "Test Task"]
+    assert [a["task_name"] for a in data["upcoming_deadlines"]] == ["Relatório"]
+
+
+@pytest.mark.asyncio
+async def test_estudante_overview_not_found(client: AsyncClient):
+    response = await client.get("/estudantes/999/overview")
+    assert response.status_code == 404
@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+import pytest
+from httpx import AsyncClient
+from app import models
+
+
+@pytest.mark.asyncio
+async def test_export_projetos_ndjson(client: AsyncClient, db_session, sample_projeto):
+    db_session.add(models.Projeto(name="Second", status="Ideação", ngo_id=sample_projeto.ngo_id))
+    await db_session.commit()
+
+    response = await client.get("/projetos/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["name"] for row in rows] == ["Test Project", "Second"]
+    assert set(rows[0]) == {"projeto_id", "disciplina_id", "ngo_id", "name", "description", "start_date", "end_date", "status"}
+
+    response = await client.get("/projetos/export", params={"status": "Ideação", "sort": "-name"})
+    assert [json.loads(line)["name"] for line in response.text.splitlines()] == ["Second"]
+
+
+@pytest.mark.asyncio
+async def test_export_task_estudantes_csv(client: AsyncClient, db_session, sample_task, sample_estudante):
+    db_session.add(models.TaskEstudante(student_id=sample_estudante.student_id, task_id=sample_task.task_id, status="Atribuída"))
+    await db_session.commit()
+
+    response = await client.get("/task-estudantes/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="task_estudante.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["status"] == "Atribuída"
+    assert rows[0]["deadline_date"] == ""
+
+
+@pytest.mark.asyncio
+async def test_export_users_omits_password(client: AsyncClient, sample_user):
+    response = await client.get("/users/export")
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows and all("password" not in row for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_export_invalid_format(client: AsyncClient):
+    assert (await client.get("/tasks/export", params={"format": "xml"})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_export_streams_from_its_own_session(client: AsyncClient, sample_projeto):
+    from main import app
+    from app.database import session_factory
+    from tests.conftest import TestingSessionLocal
+    opened = []
+
+    class _Tracked:
+        def __init__(self):
+            self.session = TestingSessionLocal()
+            opened.append(self)
+            self.closed = False
+
+        async def __aenter__(self):
+            return await self.session.__aenter__()
+
+        async def __aexit__(self, *exc):
+            self.closed = True
+            return await self.session.__aexit__(*exc)
+
+    previous = app.dependency_overrides[session_factory]
+    app.dependency_overrides[session_factory] = lambda: _Tracked
+    try:
+        response = await client.get("/projetos/export")
+    finally:
+        app.dependency_overrides[session_factory] = previous
+    assert response.status_code == 200
+    assert "Test Project" in response.text
+    assert len(opened) == 1 and opened[0].closed
+
@@ -0,0 +1,71 @@
+import pytest
+import pytest_asyncio
+from datetime import date
+from httpx import AsyncClient
+from app import models
+
+
+@pytest_asyncio.fixture
+async def projetos(db_session, sample_disciplina, sample_ong):
+    rows = [
+        models.Projeto(disciplina_id=sample_disciplina.disciplina_id, ngo_id=sample_ong.ngo_id,
+                       name=f"Projeto {i}", status=status, start_date=date(2024, 1, 1 + i))
+        for i, status in enumerate(["Planejado", "Em Andamento", "Concluído", "Em Andamento", "Planejado"])
+    ]
+    db_session.add_all(rows)
+    await db_session.commit()
+    return rows
+
+
+@pytest.mark.asyncio
+async def test_filter_by_status(client: AsyncClient, projetos):
+    response = await client.get("/projetos/", params={"status": "Em Andamento"})
+    assert response.status_code == 200
+    assert [p["name"] for p in response.json()] == ["Projeto 1", "Projeto 3"]
+
+
+@pytest.mark.asyncio
+async def test_filter_in_list_and_range(client: AsyncClient, projetos):
+    response = await client.get(
+        "/projetos/", params={"status__in": "Planejado,Concluído", "start_date__gte": "2024-01-02"}
+    )
+    assert [p["name"] for p in response.json()] == ["Projeto 2", "Projeto 4"]
+
+
+@pytest.mark.asyncio
+async def test_multi_key_sort_with_cursor(client: AsyncClient, projetos):
+    names, cursor = [], None
+    while True:
+        params = {"sort": "status,-start_date", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/projetos/", params=params)
+        assert response.status_code == 200
+        names += [p["name"] for p in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert names == ["Projeto 2", "Projeto 3", "Projeto 1", "Projeto 4", "Projeto 0"]
+
+
+@pytest.mark.asyncio
+async def test_estudante_full_name_contains(client: AsyncClient, sample_estudante):
+    response = await client.get("/estudantes/", params={"full_name": "student", "curso": "Computer Science"})
+    assert [e["student_id"] for e in response.json()] == [sample_estudante.student_id]
+    response = await client.get("/estudantes/", params={"full_name": "100%"})
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_unknown_parameter_rejected(client: AsyncClient):
+    response = await client.get("/projetos/", params={"stauts": "Planejado"})
+    assert response.status_code == 400
+    assert "stauts" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_invalid_sort_and_value(client: AsyncClient):
+    response = await client.get("/estudantes/", params={"sort": "password"})
+    assert response.status_code == 400
+    response = await client.get("/projetos/", params={"ngo_id": "abc"})
+    assert response.status_code == 400
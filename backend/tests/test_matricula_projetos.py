@@ -232,3 +232,39 @@ async def test_read_matriculas_by_project(client: AsyncClient, db_session, sampl
     data = response.json()
     assert isinstance(data, list)
     assert all(m["projeto_id"] == sample_projeto.projeto_id for m in data)
+
+
+@pytest.mark.asyncio
+async def test_create_matriculas_bulk(client: AsyncClient, db_session, sample_estudante, sample_projeto):
+    from app import models
+    other = models.Projeto(name="Other", status="Ideação")
+    db_session.add(other)
+    db_session.add(models.MatriculaProjetos(student_id=sample_estudante.student_id, projeto_id=sample_projeto.projeto_id))
+    await db_session.commit()
+
+    response = await client.post("/matriculas/bulk", json=[
+        {"student_id": sample_estudante.student_id, "projeto_id": other.projeto_id, "status": "Ativo"},
+        {"student_id": sample_estudante.student_id, "projeto_id": sample_projeto.projeto_id},
+        {"student_id": 999, "projeto_id": other.projeto_id},
+        {"student_id": sample_estudante.student_id, "projeto_id": 999},
+        {"student_id": sample_estudante.student_id, "projeto_id": other.projeto_id},
+    ])
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["status"] for r in results] == [201, 400, 404, 404, 400]
+    assert results[0]["body"]["projeto_id"] == other.projeto_id
+    assert results[0]["body"]["matricula_date"] is not None
+    assert results[1]["body"]["detail"] == "Student is already enrolled in this project"
+    assert results[2]["body"]["detail"] == "Student not found"
+    assert results[3]["body"]["detail"] == "Project not found"
+
+    response = await client.get(f"/matriculas/student/{sample_estudante.student_id}")
+    assert len(response.json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_create_matriculas_bulk_too_many(client: AsyncClient, monkeypatch):
+    from app import bulk
+    monkeypatch.setattr(bulk, "BULK_MAX_ITEMS", 1)
+    response = await client.post("/matriculas/bulk", json=[{"student_id": 1, "projeto_id": 1}] * 2)
+    assert response.status_code == 400
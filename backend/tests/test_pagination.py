@@ -0,0 +1,134 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from app import models
+from app.pagination import MAX_PAGE_SIZE
+
+
+@pytest_asyncio.fixture
+async def many_ongs(db_session):
+    ongs = [models.ONG(ngo_name=f"ONG {i:02d}") for i in range(7)]
+    db_session.add_all(ongs)
+    await db_session.commit()
+    return ongs
+
+
+@pytest.mark.asyncio
+async def test_cursor_walks_all_pages(client: AsyncClient, many_ongs):
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/ongs/", params=params)
+        assert response.status_code == 200
+        seen += [ong["ngo_id"] for ong in response.json()]
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert pages == 3
+    assert seen == sorted(ong.ngo_id for ong in many_ongs)
+
+
+@pytest.mark.asyncio
+async def test_last_page_has_no_cursor(client: AsyncClient, many_ongs):
+    response = await client.get("/ongs/", params={"limit": 50})
+    assert len(response.json()) == 7
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor(client: AsyncClient):
+    response = await client.get("/ongs/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.asyncio
+async def test_page_size_capped(client: AsyncClient):
+    response = await client.get("/tasks/", params={"limit": MAX_PAGE_SIZE + 1})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_by_parent_endpoint_paginated(client: AsyncClient, sample_projeto, db_session):
+    db_session.add_all([models.Task(projeto_id=sample_projeto.projeto_id, name=f"T{i}") for i in range(4)])
+    await db_session.commit()
+    response = await client.get(f"/tasks/projeto/{sample_projeto.projeto_id}", params={"limit": 3})
+    assert len(response.json()) == 3
+    cursor = response.headers["X-Next-Cursor"]
+    response = await client.get(f"/tasks/projeto/{sample_projeto.projeto_id}", params={"limit": 3, "cursor": cursor})
+    assert len(response.json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_total_count_is_opt_in(client: AsyncClient, many_ongs):
+    response = await client.get("/ongs/", params={"limit": 3})
+    assert "X-Total-Count" not in response.headers
+    response = await client.get("/ongs/", params={"limit": 3, "count": "true"})
+    assert response.headers["X-Total-Count"] == "7"
+    assert response.headers["X-Total-Count-Source"] == "exact"
+    response = await client.get("/ongs/", params={"limit": 3, "count": "true", "cursor": response.headers["X-Next-Cursor"]})
+    assert response.headers["X-Total-Count"] == "7"
+    assert response.headers["X-Total-Count-Source"] == "cached"
+
+
+@pytest.mark.asyncio
+async def test_total_count_respects_filters(client: AsyncClient, sample_projeto):
+    response = await client.get("/projetos/", params={"count": "true", "status": "Em Andamento"})
+    assert response.headers["X-Total-Count"] == "1"
+    response = await client.get("/projetos/", params={"count": "true", "status": "Concluído"})
+    assert response.headers["X-Total-Count"] == "0"
+
+
+@pytest.mark.asyncio
+async def test_batch_ids_preserve_order_and_report_missing(client: AsyncClient, many_ongs):
+    wanted = [many_ongs[4].ngo_id, 9999, many_ongs[1].ngo_id, many_ongs[4].ngo_id]
+    response = await client.get("/ongs/", params={"ids": ",".join(map(str, wanted)), "limit": 1})
+    assert response.status_code == 200
+    assert [o["ngo_id"] for o in response.json()] == [many_ongs[4].ngo_id, many_ongs[1].ngo_id]
+    assert response.headers["X-Missing-Ids"] == "9999"
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_batch_ids_with_fields_and_cap(client: AsyncClient, sample_estudante):
+    response = await client.get("/estudantes/", params={"ids": str(sample_estudante.student_id), "fields": "full_name"})
+    assert response.json() == [{"student_id": sample_estudante.student_id, "full_name": "Test Student"}]
+    response = await client.get("/estudantes/", params={"ids": ",".join(str(i) for i in range(1000))})
+    assert response.status_code == 400
+    response = await client.get("/tasks/", params={"ids": "1,abc"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_plan_sends_values_as_driver_parameters():
+    from sqlalchemy import select
+    from sqlalchemy.dialects.postgresql import asyncpg
+    from app.counting import _plan
+
+    class _Result:
+        def scalar(self):
+            return [{"Plan": {"Total Cost": 12.5, "Plan Rows": 40}}]
+
+    class _Connection:
+        async def exec_driver_sql(self, sql, params):
+            self.sql, self.params = sql, params
+            return _Result()
+
+    class _Session:
+        connection_ = _Connection()
+
+        def get_bind(self):
+            return type("Bind", (), {"dialect": asyncpg.dialect()})()
+
+        async def connection(self):
+            return self.connection_
+
+    db = _Session()
+    stmt = select(models.ONG).where(models.ONG.ngo_name == "x' OR 1=1 --", models.ONG.ngo_id.in_([1, 2]))
+    assert await _plan(db, stmt) == (12.5, 40)
+    assert db.connection_.sql.startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert "OR 1=1" not in db.connection_.sql
+    assert db.connection_.params == ("x' OR 1=1 --", 1, 2)
@@ -0,0 +1,115 @@
+from datetime import date, timedelta
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import ProgrammingError
+from app import models, portfolio
+
+
+@pytest.mark.asyncio
+async def test_professor_portfolio_live(client: AsyncClient, db_session, sample_professor, sample_projeto, sample_task, sample_estudante):
+    db_session.add_all([
+        models.Task(projeto_id=sample_projeto.projeto_id, name="Done", status="Concluída"),
+        models.MatriculaProjetos(student_id=sample_estudante.student_id, projeto_id=sample_projeto.projeto_id, status="Ativo"),
+        models.TaskEstudante(
+            student_id=sample_estudante.student_id,
+            task_id=sample_task.task_id,
+            deadline_date=date.today() - timedelta(days=1),
+            status="Atribuída",
+        ),
+    ])
+    await db_session.commit()
+
+    response = await client.get(f"/professores/{sample_professor.professor_id}/portfolio")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["owner_id"] == sample_professor.professor_id
+    assert data["projects"] == 1
+    assert data["students"] == 1
+    assert data["open_tasks"] == 1
+    assert data["overdue_assignments"] == 1
+    assert data["source"] == "live"
+
+
+@pytest.mark.asyncio
+async def test_ong_portfolio_without_projects(client: AsyncClient, sample_ong):
+    response = await client.get(f"/ongs/{sample_ong.ngo_id}/portfolio")
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["projects"], data["students"], data["open_tasks"], data["overdue_assignments"]) == (0, 0, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_portfolio_not_found(client: AsyncClient):
+    assert (await client.get("/professores/999/portfolio")).status_code == 404
+    assert (await client.get("/ongs/999/portfolio")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_commit_on_tracked_model_marks_views_dirty(setup_database, db_session, sample_projeto):
+    portfolio.refresher.dirty = False
+    sample_projeto.status = "Concluído"
+    await db_session.commit()
+    assert portfolio.refresher.dirty
+
+
+def test_refresher_due():
+    refresher = portfolio.PortfolioRefresher(interval=300, min_interval=10)
+    assert refresher.due(0)
+    refresher.last_refresh = 100.0
+    assert not refresher.due(105)
+    assert not refresher.due(150)
+    refresher.mark_dirty()
+    assert not refresher.due(105)
+    assert refresher.due(110)
+    refresher.dirty = False
+    assert refresher.due(400)
+
+
+def test_schema_declares_views_with_unique_index():
+    from pathlib import Path
+    schema = (Path(__file__).resolve().parents[2] / "01-schema.sql").read_text(encoding="utf-8")
+    for view in portfolio.VIEWS.values():
+        assert f"CREATE MATERIALIZED VIEW {view.name} AS" in schema
+        assert f"CREATE UNIQUE INDEX {view.name}_owner_id ON {view.name} (owner_id)" in schema
+
+
+class _AsyncpgError(Exception):
+    def __init__(self, sqlstate):
+        super().__init__("relation does not exist")
+        self.sqlstate = sqlstate
+
+
+class _PostgresWithoutViews:
+    """Sessão sqlite que se apresenta como Postgres sem as views materializadas."""
+
+    def __init__(self, session, sqlstate="42P01"):
+        self.session = session
+        self.sqlstate = sqlstate
+
+    def get_bind(self):
+        return type("Bind", (), {"dialect": postgresql.dialect()})()
+
+    def begin_nested(self):
+        return self.session.begin_nested()
+
+    async def execute(self, stmt):
+        if any(view in stmt.get_final_froms() for view in portfolio.VIEWS.values()):
+            orig = Exception("relation does not exist")
+            orig.__cause__ = _AsyncpgError(self.sqlstate)
+            raise ProgrammingError(str(stmt), {}, orig)
+        return await self.session.execute(stmt)
+
+
+@pytest.mark.asyncio
+async def test_missing_view_falls_back_to_live_query(setup_database, db_session, sample_projeto):
+    result = await portfolio.read_portfolio(_PostgresWithoutViews(db_session), "ong", sample_projeto.ngo_id)
+    assert result.source == "live"
+    assert result.projects == 1
+
+
+@pytest.mark.asyncio
+async def test_other_view_errors_are_not_swallowed(setup_database, db_session, sample_ong):
+    session = _PostgresWithoutViews(db_session, sqlstate="42501")
+    with pytest.raises(ProgrammingError):
+        await portfolio.read_portfolio(session, "ong", sample_ong.ngo_id)
@@ -0,0 +1,79 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from app import models
+from tests.conftest import test_engine
+
+
+@pytest.fixture
+def statements():
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", capture)
+    yield captured
+    event.remove(test_engine.sync_engine, "before_cursor_execute", capture)
+
+
+@pytest.mark.asyncio
+async def test_fields_narrow_list_response_and_select(client: AsyncClient, sample_projeto, statements):
+    response = await client.get("/projetos/", params={"fields": "name"})
+    assert response.status_code == 200
+    assert response.json() == [{"projeto_id": sample_projeto.projeto_id, "name": "Test Project"}]
+    select_projeto = [s for s in statements if s.startswith('SELECT "Projeto".')]
+    assert select_projeto and all("description" not in s for s in select_projeto)
+
+
+@pytest.mark.asyncio
+async def test_fields_keep_cursor_header(client: AsyncClient, db_session, sample_ong):
+    db_session.add(models.ONG(ngo_name="Outra ONG", description="texto longo"))
+    await db_session.commit()
+    response = await client.get("/ongs/", params={"fields": "ngo_name", "limit": 1})
+    assert list(response.json()[0]) == ["ngo_id", "ngo_name"]
+    cursor = response.headers["X-Next-Cursor"]
+    response = await client.get("/ongs/", params={"fields": "ngo_name", "limit": 1, "cursor": cursor})
+    assert response.json()[0]["ngo_name"] == "Outra ONG"
+
+
+@pytest.mark.asyncio
+async def test_fields_on_single_read(client: AsyncClient, sample_task):
+    response = await client.get(f"/tasks/{sample_task.task_id}", params={"fields": "status,name"})
+    assert response.json() == {"task_id": sample_task.task_id, "name": "Test Task", "status": "Pendente"}
+
+
+@pytest.mark.asyncio
+async def test_unknown_field_rejected(client: AsyncClient, sample_user):
+    response = await client.get(f"/users/{sample_user.user_id}", params={"fields": "password"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: password"
+
+
+@pytest.mark.asyncio
+async def test_no_expand_runs_single_query(client: AsyncClient, sample_projeto, statements):
+    response = await client.get(f"/projetos/{sample_projeto.projeto_id}")
+    assert response.status_code == 200
+    assert "ong" not in response.json()
+    assert len([s for s in statements if s.startswith("SELECT")]) == 1
+
+
+@pytest.mark.asyncio
+async def test_expand_nests_relationships(client: AsyncClient, sample_task, statements):
+    response = await client.get("/projetos/", params={"expand": "ong,tasks", "fields": "name"})
+    assert response.status_code == 200
+    projeto = response.json()[0]
+    assert set(projeto) == {"projeto_id", "name", "ong", "tasks"}
+    assert projeto["ong"]["ngo_name"] == "Test NGO"
+    assert [t["name"] for t in projeto["tasks"]] == ["Test Task"]
+    # ong via JOIN na query principal, tasks em uma query IN
+    selects = [s for s in statements if s.startswith("SELECT")]
+    assert len(selects) == 2
+    assert 'JOIN "ONG"' in selects[0]
+
+
+@pytest.mark.asyncio
+async def test_unknown_expand_rejected(client: AsyncClient):
+    response = await client.get("/task-estudantes/", params={"expand": "projeto"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cannot expand: projeto"
@@ -133,3 +133,43 @@ async def test_read_projetos_by_ong(client: AsyncClient, sample_projeto, sample_
     data = response.json()
     assert isinstance(data, list)
     assert all(p["ngo_id"] == sample_ong.ngo_id for p in data if p["ngo_id"])
+
+
+@pytest.mark.asyncio
+async def test_projeto_dashboard(client: AsyncClient, db_session, sample_projeto, sample_task, sample_estudante):
+    from datetime import date, timedelta
+    from app import models
+    from sqlalchemy import event
+    from tests.conftest import test_engine
+    db_session.add_all([
+        models.MatriculaProjetos(student_id=sample_estudante.student_id, projeto_id=sample_projeto.projeto_id, status="Ativo"),
+        models.TaskEstudante(student_id=sample_estudante.student_id, task_id=sample_task.task_id,
+                             status="Em Andamento", deadline_date=date.today() - timedelta(days=1)),
+        models.Task(projeto_id=sample_projeto.projeto_id, name="Sem atribuições"),
+    ])
+    await db_session.commit()
+
+    statements = []
+    capture = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(test_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        response = await client.get(f"/projetos/{sample_projeto.projeto_id}/dashboard")
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", capture)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["projeto"]["name"] == "Test Project"
+    assert data["ong"]["ngo_id"] == sample_projeto.ngo_id
+    assert data["disciplina"]["disciplina_id"] == sample_projeto.disciplina_id
+    assert [t["name"] for t in data["tasks"]] == ["Test Task", "Sem atribuições"]
+    assert data["tasks"][0]["assignments"] == {"Em Andamento": 1}
+    assert data["tasks"][1]["assignments"] == {}
+    assert data["overdue_assignments"] == 1
+    assert [e["full_name"] for e in data["estudantes"]] == ["Test Student"]
+    assert len([s for s in statements if s.startswith("SELECT")]) == 3
+
+
+@pytest.mark.asyncio
+async def test_projeto_dashboard_not_found(client: AsyncClient):
+    response = await client.get("/projetos/999/dashboard")
+    assert response.status_code == 404
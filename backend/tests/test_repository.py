@@ -0,0 +1,75 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, select
+from app import models, portfolio
+from tests.conftest import test_engine
+
+
+@pytest.fixture
+def statements():
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", capture)
+    yield captured
+    event.remove(test_engine.sync_engine, "before_cursor_execute", capture)
+
+
+def _writes(statements):
+    return [s for s in statements if s.lstrip().split(" ", 1)[0] in ("SELECT", "INSERT", "UPDATE", "DELETE")]
+
+
+@pytest.mark.asyncio
+async def test_create_update_delete_are_single_statements(client: AsyncClient, sample_projeto, statements):
+    response = await client.post("/tasks/", json={"projeto_id": sample_projeto.projeto_id, "name": "One trip"})
+    assert response.status_code == 200
+    task_id = response.json()["task_id"]
+    assert len(_writes(statements)) == 1
+    assert "RETURNING" in _writes(statements)[0]
+
+    statements.clear()
+    response = await client.put(f"/tasks/{task_id}", json={"status": "Concluída"})
+    assert response.json()["status"] == "Concluída"
+    assert len(_writes(statements)) == 1
+
+    statements.clear()
+    response = await client.delete(f"/tasks/{task_id}")
+    assert response.status_code == 200
+    assert len(_writes(statements)) == 1
+    assert (await client.get(f"/tasks/{task_id}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_missing_rows_and_references(client: AsyncClient, sample_disciplina):
+    assert (await client.put("/tasks/999", json={"name": "x"})).status_code == 404
+    assert (await client.delete("/tasks/999")).status_code == 404
+    assert (await client.put("/tasks/999", json={})).status_code == 404
+
+    response = await client.put(f"/disciplinas/{sample_disciplina.disciplina_id}", json={"professor_id": 999})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Professor not found"
+    response = await client.put("/disciplinas/999", json={"professor_id": sample_disciplina.professor_id})
+    assert response.json()["detail"] == "Disciplina not found"
+
+    response = await client.put(f"/disciplinas/{sample_disciplina.disciplina_id}", json={})
+    assert response.status_code == 200
+    assert response.json()["nome_disciplina"] == "Test Subject"
+
+
+@pytest.mark.asyncio
+async def test_delete_clears_nullable_references(client: AsyncClient, db_session, sample_professor, sample_disciplina):
+    response = await client.delete(f"/professores/{sample_professor.professor_id}")
+    assert response.status_code == 200
+    professor_id = await db_session.scalar(
+        select(models.Disciplina.professor_id).where(models.Disciplina.disciplina_id == sample_disciplina.disciplina_id)
+    )
+    assert professor_id is None
+
+
+@pytest.mark.asyncio
+async def test_statement_writes_mark_portfolios_dirty(client: AsyncClient, sample_projeto):
+    portfolio.refresher.dirty = False
+    await client.put(f"/projetos/{sample_projeto.projeto_id}", json={"status": "Concluído"})
+    assert portfolio.refresher.dirty
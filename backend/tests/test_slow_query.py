@@ -0,0 +1,32 @@
+import json
+import logging
+import pytest
+from httpx import AsyncClient
+from app import slow_query
+from tests.conftest import test_engine
+
+
+@pytest.mark.asyncio
+async def test_slow_query_logged_with_route(client: AsyncClient, sample_ong, monkeypatch, caplog):
+    slow_query.install(test_engine)
+    monkeypatch.setattr(slow_query, "SLOW_QUERY_MS", 0.0)
+    with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+        response = await client.get(f"/ongs/{sample_ong.ngo_id}")
+    assert response.status_code == 200
+    records = [json.loads(r.getMessage()) for r in caplog.records if r.name == "app.sql.slow"]
+    assert records
+    assert records[-1]["route"] == "GET /ongs/{ong_id}"
+    assert records[-1]["reason"] == "slow"
+    assert "SELECT" in records[-1]["statement"]
+    assert all(isinstance(v, str) for v in records[-1]["params"])
+
+
+@pytest.mark.asyncio
+async def test_fast_query_not_logged(client: AsyncClient, monkeypatch, caplog):
+    slow_query.install(test_engine)
+    monkeypatch.setattr(slow_query, "SLOW_QUERY_MS", 60_000.0)
+    monkeypatch.setattr(slow_query, "SLOW_QUERY_SAMPLE_RATE", 0.0)
+    with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+        response = await client.get("/ongs/")
+    assert response.status_code == 200
+    assert not [r for r in caplog.records if r.name == "app.sql.slow"]
@@ -0,0 +1,62 @@
+from datetime import date
+import pytest
+from httpx import AsyncClient
+from app import models
+
+
+@pytest.mark.asyncio
+async def test_stats_counts_by_status(client: AsyncClient, db_session, sample_projeto, sample_task, sample_estudante):
+    db_session.add_all([
+        models.Task(projeto_id=sample_projeto.projeto_id, name="Done", status="Concluída"),
+        models.TaskEstudante(student_id=sample_estudante.student_id, task_id=sample_task.task_id, status="Atrasada"),
+    ])
+    await db_session.commit()
+
+    response = await client.get("/stats/")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["projetos"] == [{"status": "Em Andamento", "count": 1}]
+    assert {b["status"]: b["count"] for b in data["tasks"]} == {"Concluída": 1, "Pendente": 1}
+    assert data["assignments"] == [{"status": "Atrasada", "count": 1}]
+
+
+@pytest.mark.asyncio
+async def test_stats_group_by_and_window(client: AsyncClient, db_session, sample_projeto, sample_task, sample_estudante):
+    db_session.add(models.TaskEstudante(
+        student_id=sample_estudante.student_id,
+        task_id=sample_task.task_id,
+        assigned_date=date(2024, 3, 1),
+    ))
+    await db_session.commit()
+
+    response = await client.get("/stats/", params={"entity": "assignments", "group_by": ["disciplina", "ong"]})
+    assert response.status_code == 200
+    data = response.json()
+    assert "projetos" not in data and "tasks" not in data
+    assert data["assignments"] == [{
+        "status": "Sem status",
+        "disciplina_id": sample_projeto.disciplina_id,
+        "ngo_id": sample_projeto.ngo_id,
+        "count": 1,
+    }]
+
+    response = await client.get("/stats/", params={"entity": "assignments", "since": "2024-04-01"})
+    assert response.json()["assignments"] == []
+    response = await client.get("/stats/", params={"entity": "tasks", "until": date.today().isoformat()})
+    assert response.json()["tasks"] == [{"status": "Pendente", "count": 1}]
+
+
+@pytest.mark.asyncio
+async def test_stats_are_cached(client: AsyncClient, db_session, sample_projeto):
+    first = (await client.get("/stats/", params={"entity": "projetos"})).json()
+    sample_projeto.status = "Concluído"
+    await db_session.commit()
+    second = (await client.get("/stats/", params={"entity": "projetos"})).json()
+    assert second == first
+
+
+@pytest.mark.asyncio
+async def test_stats_invalid_params(client: AsyncClient):
+    assert (await client.get("/stats/", params={"entity": "users"})).status_code == 400
+    assert (await client.get("/stats/", params={"group_by": "curso"})).status_code == 400
+    assert (await client.get("/stats/", params={"since": "2024-02-01", "until": "2024-01-01"})).status_code == 400
@@ -136,6 +136,7 @@ async def test_read_tasks_by_status(client: AsyncClient, sample_task):
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data, list)
+    assert data
     assert all(t["status"] == sample_task.status for t in data)
 
     
@@ -262,3 +262,21 @@ async def test_read_task_estudantes_by_status_no_results(client: AsyncClient):
     data = response.json()
     assert isinstance(data, list)
     assert len(data) == 0
+
+
+@pytest.mark.asyncio
+async def test_create_task_estudantes_bulk(client: AsyncClient, sample_estudante, sample_task):
+    response = await client.post("/task-estudantes/bulk", json=[
+        {"student_id": sample_estudante.student_id, "task_id": sample_task.task_id, "deadline_date": "2024-12-31"},
+        {"student_id": sample_estudante.student_id, "task_id": 999},
+    ])
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["status"] for r in results] == [201, 404]
+    assert results[0]["body"]["deadline_date"] == "2024-12-31"
+    assert results[1]["body"]["detail"] == "Task not found"
+
+    response = await client.post("/task-estudantes/bulk", json=[
+        {"student_id": sample_estudante.student_id, "task_id": sample_task.task_id},
+    ])
+    assert response.json()[0]["status"] == 400
@@ -0,0 +1,141 @@
+import pytest
+from httpx import AsyncClient
+
+
+def _user(username="ana", email="ana@example.com"):
+    return {"username": username, "email": email, "password": "password", "role": "Estudante"}
+
+
+@pytest.mark.asyncio
+async def test_create_user(client: AsyncClient):
+    response = await client.post("/users/", json=_user())
+    assert response.status_code == 201
+    data = response.json()
+    assert data["username"] == "ana"
+    assert "user_id" in data
+    assert "password" not in data
+
+
+@pytest.mark.asyncio
+async def test_create_user_duplicate_username(client: AsyncClient):
+    await client.post("/users/", json=_user())
+    response = await client.post("/users/", json=_user(email="other@example.com"))
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Username already registered"
+
+
+@pytest.mark.asyncio
+async def test_create_user_duplicate_email(client: AsyncClient):
+    await client.post("/users/", json=_user())
+    response = await client.post("/users/", json=_user(username="bia"))
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered"
+
+
+@pytest.mark.asyncio
+async def test_update_user_email_in_use(client: AsyncClient):
+    await client.post("/users/", json=_user())
+    other = (await client.post("/users/", json=_user(username="bia", email="bia@example.com"))).json()
+    response = await client.put(f"/users/{other['user_id']}", json={"email": "ana@example.com"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already in use"
+
+
+@pytest.mark.asyncio
+async def test_import_users_csv(client: AsyncClient, sample_user):
+    content = (
+        "username,email,password,role,full_name,curso,departamento\n"
+        "ana,ana@example.com,secret1,Estudante,Ana Lima,Direito,\n"
+        "bruno,bruno@example.com,secret2,Professor,Bruno Reis,,Computação\n"
+        f"{sample_user.username},dup@example.com,secret3,Estudante,Dup,,\n"
+        "carla,not-an-email,secret4,Estudante,Carla,,\n"
+        "ana,ana2@example.com,secret5,Estudante,Ana Again,,\n"
+    )
+    response = await client.post("/users/import", files={"file": ("roster.csv", content, "text/csv")})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert data["rejected"] == 3
+
+    estudantes = (await client.get("/estudantes/", params={"full_name": "Ana Lima"})).json()
+    assert estudantes[0]["curso"] == "Direito"
+    professores = (await client.get("/professores/")).json()
+    assert any(p["full_name"] == "Bruno Reis" and p["departamento"] == "Computação" for p in professores)
+
+    report = await client.get(f"/users/import/{data['report_id']}/errors")
+    assert report.status_code == 200
+    lines = report.text.splitlines()
+    assert lines[0] == "line,username,email,error"
+    assert [line.split(",")[0] for line in lines[1:]] == ["4", "5", "6"]
+    assert "Username already registered" in lines[1]
+
+
+@pytest.mark.asyncio
+async def test_import_users_missing_columns(client: AsyncClient):
+    response = await client.post("/users/import", files={"file": ("roster.csv", "username,email\n", "text/csv")})
+    assert response.status_code == 400
+    assert (await client.get("/users/import/unknown/errors")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_import_users_rejects_chunk_when_hashing_is_busy(client: AsyncClient, monkeypatch):
+    from app import roster
+    from app.hashing import HashQueueFull
+
+    real_hash_many = roster.import_hash_pool.hash_many
+    calls = []
+
+    async def hash_many(passwords):
+        calls.append(passwords)
+        if len(calls) == 2:
+            raise HashQueueFull()
+        return await real_hash_many(passwords)
+
+    monkeypatch.setattr(roster, "IMPORT_BATCH_SIZE", 1)
+    monkeypatch.setattr(roster.import_hash_pool, "hash_many", hash_many)
+    content = (
+        "username,email,password,role,full_name\n"
+        "ana,ana@example.com,secret1,Estudante,Ana Lima\n"
+        "bruno,bruno@example.com,secret2,Professor,Bruno Reis\n"
+        "carla,carla@example.com,secret3,Estudante,Carla Dias\n"
+    )
+    response = await client.post("/users/import", files={"file": ("roster.csv", content, "text/csv")})
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["created"], data["rejected"]) == (2, 1)
+
+    report = (await client.get(f"/users/import/{data['report_id']}/errors")).text.splitlines()
+    assert report[1].startswith("3,bruno,")
+    assert "Password hashing is busy" in report[1]
+
+
+class _AsyncpgError(Exception):
+    def __init__(self, sqlstate, constraint_name=None, table_name=None, detail=None):
+        super().__init__("duplicate key value violates unique constraint")
+        self.sqlstate = sqlstate
+        self.constraint_name = constraint_name
+        self.table_name = table_name
+        self.detail = detail
+
+
+def _integrity_error(cause):
+    from sqlalchemy.exc import IntegrityError
+    orig = Exception(f"{cause}\nDETAIL: {cause.detail}")
+    orig.__cause__ = cause
+    return IntegrityError("INSERT", {}, orig)
+
+
+def test_unique_violation_detail_uses_constraint_column():
+    from app.routers.user import _unique_violation_detail
+    error = _integrity_error(_AsyncpgError("23505", "User_username_key", "User", "Key (username)=(emailfan) already exists."))
+    assert _unique_violation_detail(error, "already registered") == "Username already registered"
+    error = _integrity_error(_AsyncpgError("23505", "User_email_key", "User"))
+    assert _unique_violation_detail(error, "already in use") == "Email already in use"
+
+
+def test_unique_violation_detail_reraises_other_integrity_errors():
+    from sqlalchemy.exc import IntegrityError
+    from app.routers.user import _unique_violation_detail
+    error = _integrity_error(_AsyncpgError("23502", table_name="User", detail="Failing row contains (email...)."))
+    with pytest.raises(IntegrityError):
+        _unique_violation_detail(error, "already registered")